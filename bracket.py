@@ -0,0 +1,125 @@
+import numpy as np
+from vecsim import elo_win_prob, match_probabilities
+from profiling import get_profiler
+
+# --------------------- 녹아웃(토너먼트) 정확 계산 (UI 없음) ---------------------
+# 대진표 트리를 따라 "r라운드까지 살아남을 확률"을 동적 계획법으로 구한다.
+#   P(i가 r라운드 승리) = P(i가 r라운드 진출) × Σ_j P(j가 r라운드 진출) × P(i가 j를 이김)
+# j는 i와 같은 크기의 맞은편 블록 팀들이다. 라운드마다 팀당 블록 크기만큼 곱하므로 전체 O(n²).
+# 빈 자리는 BYE(부전승)로 채워 슬롯 수를 2의 거듭제곱으로 맞춘다 (예: 스텝래더 승강 플레이오프).
+# 입력은 parsers.parse_bracket, 화면은 knockout.py 페이지.
+
+TIEBREAKS = ["승부차기 (50:50)", "상위 시드 진출"]
+MODELS = ["리그 모델 (승/무/패, 홈 보정)", "동아시아 모델 (골 단위)"]
+
+def round_labels(n_slots):
+    labels = []
+    m = n_slots
+    while m >= 2:
+        labels.append("결승" if m == 2 else f"{m}강")
+        m //= 2
+    return labels
+
+# --------------------- 한 경기 / 한 대결(tie) 확률 ---------------------
+def leg_distribution(model, elo_home, elo_away, home_bonus=60.0, draw_rate=0.24):
+    # 한 경기의 홈팀 기준 골득실 분포 {골득실: 확률}. 인자가 (팀, 팀) 배열이면 모든 대진을 한 번에
+    if model == MODELS[0]:
+        # 승점 모델은 골 수가 없으므로 이기면 +1, 지면 -1로 본다
+        win, draw, lose = match_probabilities(elo_home, elo_away, home_bonus)
+        return {1: win, 0: draw, -1: lose}
+    # vecsim.sample_scores(east)와 같은 분포: 무승부, 아니면 1~3골 차가 같은 확률
+    P = elo_win_prob(elo_home, elo_away)
+    p_home = np.clip(P - draw_rate / 2, 0.0, 1.0 - draw_rate)
+    p_away = 1.0 - draw_rate - p_home
+    dist = {0: np.full(np.shape(P), draw_rate)}
+    for margin in (1, 2, 3):
+        dist[margin] = p_home / 3
+        dist[-margin] = p_away / 3
+    return dist
+
+def _add_legs(first, second):
+    total = {}
+    for g1, p1 in first.items():
+        for g2, p2 in second.items():
+            total[g1 + g2] = total.get(g1 + g2, 0.0) + p1 * p2
+    return total
+
+def tie_win_matrices(elo, seed, model, home_bonus=60.0, draw_rate=0.24, tiebreak=TIEBREAKS[0], neutral=False):
+    # W[i, j] = i가 j와의 대결에서 올라갈 확률. (단판, 홈/원정 두 경기) 두 행렬을 돌려준다.
+    # 단판은 상위 시드 홈 (중립이면 홈 보정 없음), 두 경기는 골득실 합계, 합계 동점이면 tiebreak
+    n = len(elo)
+    bonus = 0.0 if neutral else home_bonus
+    home_leg = leg_distribution(model, elo[:, None], elo[None, :], bonus, draw_rate)  # i 홈
+    away_leg = {-g: p.T for g, p in home_leg.items()}                                 # i 원정
+    better = (seed[:, None] < seed[None, :]) | ((seed[:, None] == seed[None, :]) &
+                                                (np.arange(n)[:, None] < np.arange(n)[None, :]))
+    if tiebreak == TIEBREAKS[0]:
+        tie_share = np.full((n, n), 0.5)
+    else:
+        tie_share = better.astype(np.float64)
+    single = {g: np.where(better, home_leg.get(g, 0.0), away_leg.get(g, 0.0))
+              for g in set(home_leg) | set(away_leg)}
+    two_legged = _add_legs(home_leg, away_leg)
+    matrices = []
+    for dist in (single, two_legged):
+        W = sum(p for g, p in dist.items() if g > 0) + dist.get(0, 0.0) * tie_share
+        np.fill_diagonal(W, 0.0)
+        matrices.append(W)
+    return matrices
+
+# --------------------- 대진표 DP ---------------------
+def bracket_probabilities(win_by_round):
+    # win_by_round[r]: r라운드 대결 확률 행렬 (슬롯, 슬롯)
+    # 반환: (라운드 수 + 1, 슬롯) — reach[r, i] = i가 r라운드까지 이겼을 확률 (마지막 행이 우승)
+    n = win_by_round[0].shape[0]
+    reach = [np.ones(n)]
+    size = 1
+    for W in win_by_round:
+        prev = reach[-1]
+        nxt = np.empty(n)
+        for start in range(0, n, 2 * size):
+            a = slice(start, start + size)
+            b = slice(start + size, start + 2 * size)
+            nxt[a] = prev[a] * (W[a, b] @ prev[b])
+            nxt[b] = prev[b] * (W[b, a] @ prev[a])
+        reach.append(nxt)
+        size *= 2
+    return np.array(reach)
+
+def round_win_matrices(slots, model=MODELS[0], home_bonus=60.0, draw_rate=0.24, tiebreak=TIEBREAKS[0],
+                       neutral=False, two_legged_rounds=()):
+    # 라운드별 슬롯 대결 확률 행렬 (슬롯, 슬롯) 목록. two_legged_rounds: 두 경기로 치르는 라운드 번호
+    n = len(slots)
+    real = np.array([i for i, s in enumerate(slots) if s is not None], dtype=np.int64)
+    elo = np.array([slots[i]["Elo"] for i in real], dtype=np.float64)
+    seed = np.array([slots[i]["시드"] for i in real], dtype=np.int64)
+    single, two_legged = tie_win_matrices(elo, seed, model, home_bonus, draw_rate, tiebreak, neutral)
+    win_by_round = []
+    for r in range(n.bit_length() - 1):
+        # BYE: 팀은 BYE를 항상 이기고, BYE끼리는 아무나 올라가도 같다 (진출 확률 질량만 옮겨 감)
+        W = np.full((n, n), 0.5)
+        W[real, :] = 1.0
+        W[:, real] = 0.0
+        W[np.ix_(real, real)] = two_legged if r in two_legged_rounds else single
+        win_by_round.append(W)
+    return win_by_round
+
+def run_bracket(slots, model=MODELS[0], home_bonus=60.0, draw_rate=0.24, tiebreak=TIEBREAKS[0],
+                neutral=False, two_legged_rounds=(), prof=None):
+    prof = get_profiler(prof)
+    real = [i for i, s in enumerate(slots) if s is not None]
+    with prof.phase("경기확률"):
+        win_by_round = round_win_matrices(slots, model, home_bonus, draw_rate, tiebreak, neutral, two_legged_rounds)
+    with prof.phase("진출확률"):
+        reach = bracket_probabilities(win_by_round)
+    prof.add_sims(1)
+    with prof.phase("요약"):
+        summary = {}
+        for i in real:
+            summary[slots[i]["팀명"]] = {
+                "시드": slots[i]["시드"],
+                "Elo": slots[i]["Elo"],
+                "라운드별진출(%)": (reach[1:, i] * 100).tolist(),
+                "우승확률(%)": float(reach[-1, i] * 100),
+            }
+    return summary
@@ -0,0 +1,210 @@
+import pandas as pd
+import numpy as np
+from array import array
+from collections import defaultdict
+from datetime import date
+from profiling import get_profiler
+from parsers import parse_initial_elo, parse_results
+# ClubElo 상수와 식은 vecsim(동적 Elo 시뮬레이션)과 하나로 공유한다
+from vecsim import HFA, K_VALUE, expected_score, g_factor
+
+# --------------------- ClubElo 리플레이 (UI 없음) ---------------------
+# elp.py 페이지와 배치 실행(python profiling.py elp ...)이 같이 쓴다.
+
+# --------------------- 레이팅 이력 (날짜별 기록) ---------------------
+# 리플레이 중 바뀐 팀마다 (날짜, 팀번호, Elo, Tilt, 승점) 한 행씩 열 단위 배열에 쌓는다.
+# 기준일 조회는 (팀번호, 날짜) 순으로 정렬한 키에서 모든 팀을 searchsorted 한 번으로 찾는다.
+class RatingHistory:
+    def __init__(self):
+        self.team_names = []
+        self.team_ids = {}
+        self.dates = array('q')  # date.toordinal()
+        self.teams = array('q')
+        self.elos = array('d')
+        self.tilts = array('d')
+        self.points = array('q')
+        self._cache = None
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if self.dates else None
+
+    def record(self, day, team, elo, tilt, pts):
+        # 날짜 순으로만 쌓는다 (리플레이 순서 = 날짜 순서)
+        if team not in self.team_ids:
+            self.team_ids[team] = len(self.team_names)
+            self.team_names.append(team)
+        self.dates.append(day)
+        self.teams.append(self.team_ids[team])
+        self.elos.append(elo)
+        self.tilts.append(tilt)
+        self.points.append(pts)
+        self._cache = None
+
+    def clamp_dates(self, day):
+        # day보다 늦은 기록을 day로 당긴다 (경기 기록이 없을 때 초기 Elo 날짜를 맞추는 용도)
+        for i, d in enumerate(self.dates):
+            if d > day:
+                self.dates[i] = day
+        self._cache = None
+
+    def _columns(self):
+        # 조회용 numpy 사본은 마지막 기록 이후 처음 조회할 때 한 번만 만든다
+        if self._cache is None:
+            dates = np.array(self.dates, dtype=np.int64)
+            teams = np.array(self.teams, dtype=np.int64)
+            span = int(dates.max()) + 1
+            keys = teams * span + dates
+            # 같은 팀·같은 날짜는 기록 순서를 유지 → side="right"로 그날 마지막 기록을 찾는다
+            order = np.argsort(keys, kind="stable")
+            self._cache = {
+                "span": span,
+                "keys": keys[order],
+                "order": order,
+                "dates": dates,
+                "teams": teams,
+                "elos": np.array(self.elos, dtype=np.float64),
+                "tilts": np.array(self.tilts, dtype=np.float64),
+                "points": np.array(self.points, dtype=np.int64),
+            }
+        return self._cache
+
+    def as_of(self, day):
+        # {팀: (Elo, Tilt, 승점)} — 기준일(포함)까지의 마지막 기록, 그 전 기록이 없는 팀은 빠진다
+        if not self.dates:
+            return {}
+        cols = self._columns()
+        span, keys = cols["span"], cols["keys"]
+        team_ids = np.arange(len(self.team_names))
+        pos = np.searchsorted(keys, team_ids * span + min(day, span - 1), side="right") - 1
+        found = (pos >= 0) & (keys[np.maximum(pos, 0)] // span == team_ids)
+        rows = cols["order"][pos[found]]
+        return {self.team_names[t]: (float(cols["elos"][r]), float(cols["tilts"][r]), int(cols["points"][r]))
+                for t, r in zip(team_ids[found], rows)}
+
+    def team_series(self, team):
+        if team not in self.team_ids:
+            return pd.DataFrame(columns=["날짜", "Elo", "승점"])
+        cols = self._columns()
+        mask = cols["teams"] == self.team_ids[team]
+        return pd.DataFrame({
+            "날짜": [date.fromordinal(int(d)) for d in cols["dates"][mask]],
+            "Elo": cols["elos"][mask],
+            "승점": cols["points"][mask],
+        })
+
+def team_input_text(snapshot):
+    # league / k1 / romania 팀 입력 형식 (팀이름 Elo 승점). 그쪽 입력은 공백으로 나누므로 이름의 공백은 _로
+    ordered = sorted(snapshot, key=lambda t: (-snapshot[t][2], -snapshot[t][0]))
+    return "\n".join(f"{t.replace(' ', '_')} {snapshot[t][0]:.1f} {snapshot[t][2]}" for t in ordered)
+
+# --------------------- 리플레이 상태 ---------------------
+class EloReplay:
+    def __init__(self):
+        self.elos = defaultdict(lambda: 1500.0)
+        self.tilts = defaultdict(lambda: 1.0)
+        self.points = defaultdict(int)
+        self.history = RatingHistory()
+        self.n_results = 0
+
+    # --------------------- Elo/승점 업데이트 ---------------------
+    def update_elo(self, home: str, away: str, home_goals: int, away_goals: int) -> None:
+        elos, tilts, points = self.elos, self.tilts, self.points
+        home_adj_elo = elos[home] + HFA
+        away_elo = elos[away]
+        dr = home_adj_elo - away_elo
+        expected_home = expected_score(dr)
+
+        if home_goals > away_goals:
+            result_home = 1.0
+        elif home_goals == away_goals:
+            result_home = 0.5
+        else:
+            result_home = 0.0
+
+        diff = abs(home_goals - away_goals)
+        g_fac = g_factor(diff)
+        change = K_VALUE * g_fac * (result_home - expected_home)
+        elos[home] += change
+        elos[away] -= change
+
+        # 승점 업데이트
+        if home_goals > away_goals:
+            points[home] += 3
+        elif home_goals < away_goals:
+            points[away] += 3
+        else:
+            points[home] += 1
+            points[away] += 1
+
+        # Tilt (원본 알고리즘)
+        total_goals = home_goals + away_goals
+        EXPECTED_GOALS = 2.5
+        tilts[home] = 0.98 * tilts[home] + 0.02 * (total_goals / tilts[away] / EXPECTED_GOALS)
+        tilts[away] = 0.98 * tilts[away] + 0.02 * (total_goals / tilts[home] / EXPECTED_GOALS)
+
+    def _record(self, day, team):
+        self.history.record(day, team, self.elos[team], self.tilts[team], self.points[team])
+
+    # --------------------- 초기 입력 처리 ---------------------
+    def set_initial(self, rows, base_date=None, on_error=None):
+        # rows: parse_initial_elo 결과 [(팀, Elo, 승점)]
+        day = (base_date or date.today()).toordinal()
+        last = self.history.last_date
+        if last is not None and day < last:
+            message = f"기준 날짜가 마지막 기록({date.fromordinal(last)})보다 이릅니다."
+            if on_error is None:
+                raise ValueError(message)
+            on_error(message)
+            return
+        for team, elo_val, pts_val in rows:
+            self.elos[team] = elo_val
+            self.points[team] = pts_val
+            self._record(day, team)
+
+    # --------------------- 경기 결과 처리 ---------------------
+    def apply_results(self, results, prof=None, on_error=None):
+        # results: parse_results 결과. 이미 기록된 날짜보다 이른 경기는 건너뛴다 (리플레이 순서 = 날짜 순서)
+        prof = get_profiler(prof)
+        with prof.phase("Elo갱신"):
+            # 아직 경기 기록이 없으면 초기 Elo는 가장 이른 경기 날짜 시점의 값으로 본다
+            # (기준 날짜 기본값이 오늘이라 과거 날짜 결과가 모두 순서 오류로 막히던 문제)
+            if not self.n_results and results and len(self.history):
+                self.history.clamp_dates(min(r[0] for r in results))
+            last_day = self.history.last_date
+            applied = 0
+            for day, home, away, hg, ag, line in results:
+                if last_day is not None and day < last_day:
+                    message = f"날짜 순서 오류 (이전 경기보다 이른 날짜): {line}"
+                    if on_error is None:
+                        raise ValueError(message)
+                    on_error(message)
+                    continue
+                last_day = day
+                self.update_elo(home, away, hg, ag)
+                self._record(day, home)
+                self._record(day, away)
+                applied += 1
+            self.n_results += applied
+        # 리플레이는 경기 수를 처리 단위로 집계
+        prof.add_sims(applied)
+        return applied
+
+    def table_rows(self):
+        sorted_teams = sorted(self.elos.keys(), key=lambda t: (-self.points[t], -self.elos[t]))
+        return [{"팀명": t, "Elo": round(self.elos[t], 1), "승점": self.points[t]} for t in sorted_teams]
+
+def replay(init_text, result_text, base_date=None, prof=None):
+    # 배치 리플레이: 초기 Elo → 경기 결과. 입력 오류는 ValueError(InputError)
+    prof = get_profiler(prof)
+    state = EloReplay()
+    base_day = (base_date or date.today()).toordinal()
+    with prof.phase("파싱"):
+        rows = parse_initial_elo(init_text)
+        results = parse_results(result_text, base_day)
+    state.set_initial(rows, base_date)
+    state.apply_results(results, prof=prof)
+    return state
@@ -0,0 +1,311 @@
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from vecsim import FORMATS, iter_chunks
+from distributions import SimAccumulator, accumulate_sims
+
+# --------------------- 분산 시뮬레이션 (코디네이터 / 워커) ---------------------
+# 코디네이터가 전체 시뮬레이션을 샤드로 나누고 HTTP로 나눠 준다.
+#   GET  /shard  → 샤드 명세 (없으면 {"wait": true}, 모두 끝나면 {"done": true})
+#   POST /result → 샤드 결과 (SimAccumulator.to_json) 병합
+#   POST /fail   → 워커가 샤드를 포기, 즉시 재배정
+#   GET  /status → 진행 상황
+# 샤드마다 고유 난수 스트림 번호가 있어, 재배정되어도 같은 샤드는 같은 결과를 낸다.
+# 응답이 lease_timeout 안에 오지 않은 샤드는 다른 워커에게 다시 준다. 느린 워커일 수도 있으므로
+# 실패로 세지 않고, 먼저 도착한 결과를 쓴다.
+# 한 샤드가 /fail로 max_attempts번 실패하면 재시도해도 같으므로 전체 작업을 중단한다.
+
+DEFAULT_PORT = 8765
+SHARD_SIMS = 100_000
+MAX_ATTEMPTS = 3
+
+def shard_rng(seed, stream_id):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream_id,)))
+
+def run_shard(spec):
+    simulate, fmt_kwargs = FORMATS[spec["format"]]
+    matches = [tuple(m) for m in spec["matches"]]
+    rng = shard_rng(spec["seed"], spec["stream_id"])
+    # league는 페이지와 같이 최다 승점 동률 팀을 모두 우승으로 집계
+    acc = accumulate_sims(rng, simulate, spec["teams"], matches, spec["n_sims"],
+                          shared_first=spec["format"] == "league", **fmt_kwargs, **spec.get("options", {}))
+    return {"shard_id": spec["shard_id"], "n_sims": spec["n_sims"], "accumulator": acc.to_json()}
+
+class Coordinator:
+    def __init__(self, fmt, teams, matches, n_sims, shard_sims=SHARD_SIMS, seed=None,
+                 options=None, lease_timeout=120.0, max_attempts=MAX_ATTEMPTS):
+        if fmt not in FORMATS:
+            raise ValueError(f"알 수 없는 포맷: {fmt}")
+        self.fmt = fmt
+        self.teams = teams
+        self.matches = [list(m) for m in matches]
+        self.options = options or {}
+        self.seed = int(np.random.SeedSequence(seed).entropy)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.shards = dict(enumerate(iter_chunks(n_sims, shard_sims)))
+        self.pending = deque(self.shards)
+        self.leases = {}
+        self.done = set()
+        self.redispatched = 0
+        self.attempts = {}
+        self.aborted = None
+        self.acc = SimAccumulator(teams, shared_first=fmt == "league")
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.shards:
+            self.finished.set()
+
+    def _requeue(self, shard_id):
+        del self.leases[shard_id]
+        self.pending.append(shard_id)
+        self.redispatched += 1
+
+    def _retry(self, shard_id, error):
+        self.attempts[shard_id] = self.attempts.get(shard_id, 0) + 1
+        if self.attempts[shard_id] >= self.max_attempts:
+            del self.leases[shard_id]
+            self.aborted = f"샤드 {shard_id}이(가) {self.attempts[shard_id]}번 실패했습니다: {error}"
+            self.finished.set()
+            return
+        self._requeue(shard_id)
+
+    def _reclaim_expired(self, now):
+        # 임대 만료는 실패 횟수에 넣지 않는다 (원래 워커의 결과가 늦게 와도 받아들인다)
+        for shard_id, deadline in list(self.leases.items()):
+            if deadline < now:
+                self._requeue(shard_id)
+
+    def next_shard(self):
+        with self.lock:
+            if self.finished.is_set():
+                return {"done": True}
+            self._reclaim_expired(time.monotonic())
+            if not self.pending:
+                return {"wait": True}
+            shard_id = self.pending.popleft()
+            self.leases[shard_id] = time.monotonic() + self.lease_timeout
+            return {
+                "shard_id": shard_id,
+                "stream_id": shard_id,
+                "n_sims": self.shards[shard_id],
+                "format": self.fmt,
+                "teams": self.teams,
+                "matches": self.matches,
+                "seed": self.seed,
+                "options": self.options,
+            }
+
+    def submit(self, result):
+        with self.lock:
+            shard_id = result.get("shard_id")
+            # 재배정 뒤 늦게 도착한 중복 결과는 버린다
+            if shard_id not in self.shards or shard_id in self.done:
+                return False
+            shard_acc = SimAccumulator.from_json(result["accumulator"])
+            if result.get("n_sims") != self.shards[shard_id] or shard_acc.n_sims != self.shards[shard_id]:
+                return False
+            self.acc.merge(shard_acc)
+            self.done.add(shard_id)
+            self.leases.pop(shard_id, None)
+            if shard_id in self.pending:
+                self.pending.remove(shard_id)
+            if len(self.done) == len(self.shards):
+                self.finished.set()
+            return True
+
+    def fail(self, shard_id, error=None):
+        with self.lock:
+            if shard_id in self.leases and not self.finished.is_set():
+                self._retry(shard_id, error or "워커 실패 보고")
+
+    def status(self):
+        with self.lock:
+            return {
+                "shards": len(self.shards),
+                "done": len(self.done),
+                "leased": len(self.leases),
+                "pending": len(self.pending),
+                "redispatched": self.redispatched,
+                "aborted": self.aborted,
+            }
+
+    def summary(self):
+        with self.lock:
+            n_sims = self.acc.n_sims
+            summary = self.acc.summary()
+        return {"시뮬레이션수": n_sims, "팀별": summary}
+
+    def serve(self, host="0.0.0.0", port=DEFAULT_PORT):
+        server = ThreadingHTTPServer((host, port), _CoordinatorHandler)
+        server.coordinator = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def run(self, host="0.0.0.0", port=DEFAULT_PORT, progress=None):
+        server = self.serve(host, port)
+        try:
+            while not self.finished.wait(1.0):
+                # 샤드를 요청하는 워커가 하나도 없어도 만료된 임대는 대기열로 돌려 둔다
+                with self.lock:
+                    self._reclaim_expired(time.monotonic())
+                if progress:
+                    progress(self.status())
+        finally:
+            # 폴링 중인 워커가 "done"을 받고 끝날 수 있도록 잠시 더 응답
+            time.sleep(0.5)
+            server.shutdown()
+            server.server_close()
+        if self.aborted:
+            raise RuntimeError(self.aborted)
+        return self.summary()
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    def _send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        coordinator = self.server.coordinator
+        if self.path == "/shard":
+            self._send_json(coordinator.next_shard())
+        elif self.path == "/status":
+            self._send_json(coordinator.status())
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        coordinator = self.server.coordinator
+        try:
+            data = self._read_json()
+        except ValueError:
+            self._send_json({"error": "invalid json"}, status=400)
+            return
+        if self.path == "/result":
+            self._send_json({"accepted": coordinator.submit(data)})
+        elif self.path == "/fail":
+            coordinator.fail(data.get("shard_id"), data.get("error"))
+            self._send_json({"ok": True})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def log_message(self, format, *args):
+        pass
+
+# --------------------- 워커 ---------------------
+def _request_json(url, data=None, timeout=30.0):
+    body = None if data is None else json.dumps(data).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+def _post_quietly(url, data):
+    # 결과/실패 보고가 끊겨도 워커는 계속 돈다 (보고 못 한 샤드는 임대 만료 뒤 재배정)
+    try:
+        return _request_json(url, data)
+    except (urllib.error.URLError, ConnectionError, TimeoutError) as e:
+        print(f"보고 실패 ({url}): {e}", file=sys.stderr)
+        return None
+
+def run_worker(url, poll_interval=1.0, connect_timeout=30.0):
+    url = url.rstrip("/")
+    completed = 0
+    connected = False
+    started = time.monotonic()
+    while True:
+        try:
+            spec = _request_json(url + "/shard")
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            # 처음 연결 전에는 코디네이터가 뜰 때까지 기다리고, 연결된 뒤 끊기면 작업 종료로 본다
+            if connected or time.monotonic() - started > connect_timeout:
+                return completed
+            time.sleep(poll_interval)
+            continue
+        connected = True
+        if spec.get("done"):
+            return completed
+        if spec.get("wait"):
+            time.sleep(poll_interval)
+            continue
+        try:
+            result = run_shard(spec)
+        except Exception as e:
+            # 재시도 횟수는 코디네이터가 센다. 워커는 다음 샤드를 계속 받는다
+            print(f"샤드 {spec['shard_id']} 실패: {e!r}", file=sys.stderr)
+            _post_quietly(url + "/fail", {"shard_id": spec["shard_id"], "error": repr(e)})
+            continue
+        if _post_quietly(url + "/result", result) is not None:
+            completed += 1
+
+# --------------------- 명령행 ---------------------
+# 코디네이터: python distributed.py coordinator k1 teams.txt matches.txt --sims 10000000 -o result.json
+# 워커:       python distributed.py worker http://코디네이터주소:8765
+def _main(argv):
+    import argparse
+    from parsers import InputError, parse_format
+    parser = argparse.ArgumentParser(description="분산 시뮬레이션 코디네이터/워커")
+    sub = parser.add_subparsers(dest="role", required=True)
+    coord = sub.add_parser("coordinator")
+    coord.add_argument("format", choices=list(FORMATS))
+    coord.add_argument("teams_file")
+    coord.add_argument("matches_file")
+    coord.add_argument("--sims", type=int, default=1_000_000)
+    coord.add_argument("--shard-sims", type=int, default=SHARD_SIMS)
+    coord.add_argument("--seed", type=int)
+    coord.add_argument("--dynamic-elo", action="store_true")
+    coord.add_argument("--lease-timeout", type=float, default=120.0)
+    coord.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    coord.add_argument("--host", default="0.0.0.0")
+    coord.add_argument("--port", type=int, default=DEFAULT_PORT)
+    coord.add_argument("-o", "--output")
+    worker = sub.add_parser("worker")
+    worker.add_argument("url")
+    worker.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.role == "worker":
+        n = run_worker(args.url, poll_interval=args.poll_interval)
+        print(f"완료한 샤드: {n}", file=sys.stderr)
+        return
+
+    # 입력 형식은 각 시뮬레이터 페이지와 같은 parsers 모듈을 쓴다 (페이지를 import하지 않음)
+    with open(args.teams_file, encoding="utf-8") as f:
+        team_text = f.read()
+    with open(args.matches_file, encoding="utf-8") as f:
+        match_text = f.read()
+    try:
+        teams, matches = parse_format(args.format, team_text, match_text)
+    except InputError as e:
+        raise SystemExit(f"팀/경기 입력 오류: {e}")
+    coordinator = Coordinator(args.format, teams, matches, args.sims, shard_sims=args.shard_sims,
+                              seed=args.seed, options={"dynamic_elo": args.dynamic_elo},
+                              lease_timeout=args.lease_timeout, max_attempts=args.max_attempts)
+    try:
+        result = coordinator.run(args.host, args.port,
+                                 progress=lambda s: print(f"{s['done']}/{s['shards']} 샤드 완료", file=sys.stderr))
+    except RuntimeError as e:
+        raise SystemExit(f"작업 중단: {e}")
+    out = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
@@ -0,0 +1,205 @@
+import numpy as np
+from profiling import get_profiler
+from vecsim import iter_chunks, rank_counts
+
+# --------------------- 승점/골득실 분포, 상대 순위 ---------------------
+# 시뮬레이션 청크마다 bincount로 누적한다. 히스토그램 칸은 실제로 관측된 값 범위만큼만 두므로
+# 메모리는 (팀 수 × 값 범위), 상대 순위 행렬은 (팀 수 × 팀 수)로 시뮬레이션 수와 무관하다.
+
+class Histogram:
+    # 팀별 정수값 히스토그램: counts[t, v - offset] = t팀이 값 v로 끝난 횟수
+    def __init__(self, n_teams, offset=0, counts=None):
+        self.offset = offset
+        self.counts = np.zeros((n_teams, 0), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    def _ensure(self, lo, hi):
+        n_teams, n_bins = self.counts.shape
+        if n_bins == 0:
+            self.offset = lo
+            self.counts = np.zeros((n_teams, hi - lo + 1), dtype=np.int64)
+            return
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, self.offset + n_bins - 1)
+        if new_lo == self.offset and new_hi == self.offset + n_bins - 1:
+            return
+        grown = np.zeros((n_teams, new_hi - new_lo + 1), dtype=np.int64)
+        start = self.offset - new_lo
+        grown[:, start:start + n_bins] = self.counts
+        self.offset = new_lo
+        self.counts = grown
+
+    def add(self, values):
+        # values: (시뮬, 팀) 정수 배열
+        if values.size == 0:
+            return
+        self._ensure(int(values.min()), int(values.max()))
+        n_teams, n_bins = self.counts.shape
+        flat = (np.arange(n_teams)[None, :] * n_bins + (values - self.offset)).ravel()
+        self.counts += np.bincount(flat, minlength=n_teams * n_bins).reshape(n_teams, n_bins)
+
+    def merge(self, other):
+        if other.counts.shape[1] == 0:
+            return
+        self._ensure(other.offset, other.offset + other.counts.shape[1] - 1)
+        start = other.offset - self.offset
+        self.counts[:, start:start + other.counts.shape[1]] += other.counts
+
+    def to_json(self):
+        return {"offset": self.offset, "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_json(cls, data, n_teams):
+        counts = np.asarray(data["counts"], dtype=np.int64).reshape(n_teams, -1)
+        return cls(n_teams, offset=data["offset"], counts=counts)
+
+    def percentages(self, team_idx, n_sims):
+        row = self.counts[team_idx]
+        return {int(self.offset + v): float(row[v] / n_sims * 100) for v in np.flatnonzero(row)}
+
+def above_counts(rank):
+    # above[i, j] = i팀이 j팀보다 높은 순위로 끝난 시뮬레이션 수
+    return (rank[:, :, None] < rank[:, None, :]).sum(axis=0)
+
+class SimAccumulator:
+    # 시뮬레이션 청크 결과 {"points", "rank"[, "gd"]}를 팀별로 누적한다. 모든 페이지와 분산 샤드가 같이 쓴다.
+    # shared_first: 최다 승점 동률 팀을 모두 우승으로 집계 (league 페이지), 아니면 순위 0만
+    def __init__(self, names, shared_first=False):
+        self.names = list(names)
+        n_teams = len(self.names)
+        self.shared_first = shared_first
+        self.n_sims = 0
+        self.rank_count = np.zeros((n_teams, n_teams), dtype=np.int64)
+        self.first_count = np.zeros(n_teams, dtype=np.int64)
+        self.point_sum = np.zeros(n_teams, dtype=np.int64)
+        self.points_hist = Histogram(n_teams)
+        self.above = np.zeros((n_teams, n_teams), dtype=np.int64)
+        self.gd_sum = None
+        self.gd_hist = None
+
+    def add(self, sim):
+        rank, pts = sim["rank"], sim["points"]
+        self.n_sims += len(rank)
+        self.rank_count += rank_counts(rank)
+        if self.shared_first:
+            self.first_count += (pts == pts.max(axis=1, keepdims=True)).sum(axis=0)
+        else:
+            self.first_count += (rank == 0).sum(axis=0)
+        self.point_sum += pts.sum(axis=0)
+        self.points_hist.add(pts)
+        self.above += above_counts(rank)
+        if "gd" in sim:
+            self._ensure_gd()
+            self.gd_sum += sim["gd"].sum(axis=0)
+            self.gd_hist.add(sim["gd"])
+
+    def _ensure_gd(self):
+        if self.gd_hist is None:
+            self.gd_sum = np.zeros(len(self.names), dtype=np.int64)
+            self.gd_hist = Histogram(len(self.names))
+
+    def merge(self, other):
+        self.n_sims += other.n_sims
+        self.rank_count += other.rank_count
+        self.first_count += other.first_count
+        self.point_sum += other.point_sum
+        self.points_hist.merge(other.points_hist)
+        self.above += other.above
+        if other.gd_hist is not None:
+            self._ensure_gd()
+            self.gd_sum += other.gd_sum
+            self.gd_hist.merge(other.gd_hist)
+
+    def to_json(self):
+        data = {
+            "names": self.names,
+            "shared_first": self.shared_first,
+            "n_sims": self.n_sims,
+            "rank_count": self.rank_count.tolist(),
+            "first_count": self.first_count.tolist(),
+            "point_sum": self.point_sum.tolist(),
+            "points_hist": self.points_hist.to_json(),
+            "above": self.above.tolist(),
+        }
+        if self.gd_hist is not None:
+            data["gd_sum"] = self.gd_sum.tolist()
+            data["gd_hist"] = self.gd_hist.to_json()
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        acc = cls(data["names"], data["shared_first"])
+        n_teams = len(acc.names)
+        acc.n_sims = int(data["n_sims"])
+        acc.rank_count = np.asarray(data["rank_count"], dtype=np.int64).reshape(n_teams, n_teams)
+        acc.first_count = np.asarray(data["first_count"], dtype=np.int64)
+        acc.point_sum = np.asarray(data["point_sum"], dtype=np.int64)
+        acc.points_hist = Histogram.from_json(data["points_hist"], n_teams)
+        acc.above = np.asarray(data["above"], dtype=np.int64).reshape(n_teams, n_teams)
+        if "gd_hist" in data:
+            acc.gd_sum = np.asarray(data["gd_sum"], dtype=np.int64)
+            acc.gd_hist = Histogram.from_json(data["gd_hist"], n_teams)
+        return acc
+
+    def summary(self):
+        n = max(self.n_sims, 1)
+        ranks = np.arange(1, len(self.names) + 1)
+        summary = {}
+        for i, team in enumerate(self.names):
+            summary[team] = {
+                "우승확률(%)": float(self.first_count[i] / n * 100),
+                "평균순위": float(self.rank_count[i] @ ranks / n),
+                "평균승점": float(self.point_sum[i] / n),
+                "순위별확률(%)": (self.rank_count[i] / n * 100).tolist(),
+                "승점분포(%)": self.points_hist.percentages(i, n),
+                "상위확률(%)": {other: float(self.above[i, j] / n * 100)
+                             for j, other in enumerate(self.names) if j != i},
+            }
+            if self.gd_hist is not None:
+                summary[team]["평균골득실"] = float(self.gd_sum[i] / n)
+                summary[team]["골득실분포(%)"] = self.gd_hist.percentages(i, n)
+        return summary
+
+def accumulate_sims(rng, simulate, teams, matches, n_sims, prof=None, shared_first=False, **sim_kwargs):
+    # simulate: vecsim 포맷 시뮬레이터. 청크 단위로 돌려 SimAccumulator에 모은다
+    prof = get_profiler(prof)
+    acc = SimAccumulator(teams.keys(), shared_first)
+    for n_chunk in iter_chunks(n_sims):
+        sim = simulate(rng, teams, matches, n_chunk, prof=prof, **sim_kwargs)
+        with prof.phase("집계"):
+            acc.add(sim)
+    prof.add_sims(n_sims)
+    return acc
+
+def run_summary(simulate, teams, matches, n_sims, rng=None, prof=None, shared_first=False, **sim_kwargs):
+    # 페이지와 배치 실행 공용: 시뮬레이션을 누적해 팀별 요약 dict를 돌려준다
+    prof = get_profiler(prof)
+    rng = np.random.default_rng() if rng is None else rng
+    acc = accumulate_sims(rng, simulate, teams, matches, n_sims, prof=prof, shared_first=shared_first, **sim_kwargs)
+    with prof.phase("요약"):
+        return acc.summary()
+
+# --------------------- Streamlit 패널 ---------------------
+def render_distribution_panel(summary, key_prefix=""):
+    import streamlit as st
+    import pandas as pd
+    names = list(summary.keys())
+    st.markdown("### 📊 승점 분포 / 상대 순위 확률")
+    team = st.selectbox("팀 선택", names, key=f"{key_prefix}dist_team")
+    dists = [("승점", "승점분포(%)")]
+    if "골득실분포(%)" in summary[team]:
+        dists.append(("골득실", "골득실분포(%)"))
+    for label, key in dists:
+        dist = summary[team][key]
+        values = sorted(dist)
+        df = pd.DataFrame({label: values, "확률(%)": [dist[v] for v in values]}).set_index(label)
+        st.bar_chart(df)
+        target = st.number_input(f"정확히 몇 {label}?", value=int(values[len(values) // 2]) if values else 0,
+                                 step=1, key=f"{key_prefix}dist_{key}")
+        at_least = sum(p for v, p in dist.items() if v >= target)
+        st.write(f"**{team}** {label} 정확히 {target}: {dist.get(int(target), 0.0):.2f}%, "
+                 f"{target} 이상: {at_least:.2f}%")
+    st.markdown("#### 상대 순위 확률 (%) — 행 팀이 열 팀보다 위에서 끝날 확률")
+    st.dataframe(pd.DataFrame([
+        {"팀명": t, **{o: (round(summary[t]["상위확률(%)"][o], 2) if o != t else None) for o in names}}
+        for t in names
+    ]), use_container_width=True)
@@ -0,0 +1,51 @@
+import streamlit as st
+import pandas as pd
+import parsers
+from vecsim import MODEL_PARAMS
+from bracket import MODELS, TIEBREAKS, round_labels, run_bracket
+from profiling import sidebar_options, render_sidebar
+
+# --------------------- 녹아웃(토너먼트) 정확 계산 ---------------------
+# 계산은 bracket.py (대진표 DP), 입력 파싱은 parsers.parse_bracket
+
+def parse_bracket(input_text):
+    return parsers.parse_bracket(input_text, on_error=st.error)
+
+# --------------------- Streamlit UI ---------------------
+st.title("🏆 토너먼트(녹아웃) 정확 계산")
+st.caption("시뮬레이션 없이 대진표를 따라 진출/우승 확률을 정확히 계산합니다.")
+
+team_input = st.text_area("대진표 순서대로 팀 입력 (팀이름 Elo [시드]), 빈 자리는 BYE", height=160)
+model = st.radio("경기 모델", MODELS)
+if model == MODELS[0]:
+    home_bonus = st.number_input("홈Elo보정", value=MODEL_PARAMS["홈Elo보정"], step=10.0)
+    draw_rate = MODEL_PARAMS["무승부율"]
+else:
+    home_bonus = 0.0
+    draw_rate = st.number_input("무승부율", min_value=0.0, max_value=0.9, value=MODEL_PARAMS["무승부율"], step=0.01)
+neutral = st.checkbox("중립 경기장 (단판도 홈 보정 없음)", value=False, disabled=model != MODELS[0])
+tiebreak = st.radio("무승부 / 합계 동점 처리", TIEBREAKS)
+n_lines = len([l for l in team_input.strip().splitlines() if l.strip()])
+labels = round_labels(n_lines) if n_lines >= 2 and not n_lines & (n_lines - 1) else []
+two_legged = st.multiselect("홈/원정 두 경기로 치르는 라운드", labels)
+prof = sidebar_options()
+
+if st.button("확률 계산"):
+    with prof:
+        with prof.phase("파싱"):
+            slots = parse_bracket(team_input)
+        if not slots:
+            st.stop()
+        labels = round_labels(len(slots))
+        summary = run_bracket(slots, model=model, home_bonus=home_bonus, draw_rate=draw_rate, tiebreak=tiebreak,
+                              neutral=neutral, two_legged_rounds={labels.index(r) for r in two_legged},
+                              prof=prof)
+    render_sidebar(prof)
+    # r라운드를 이기면 다음 라운드 진출, 결승을 이기면 우승
+    columns = [f"{label} 진출(%)" for label in labels[1:]] + ["우승(%)"]
+    rows = []
+    for team, res in sorted(summary.items(), key=lambda kv: -kv[1]["우승확률(%)"]):
+        row = {"팀명": team, "시드": res["시드"], "Elo": res["Elo"]}
+        row.update({col: round(p, 2) for col, p in zip(columns, res["라운드별진출(%)"])})
+        rows.append(row)
+    st.dataframe(pd.DataFrame(rows), use_container_width=True)
@@ -0,0 +1,161 @@
+import re
+from datetime import date
+
+# --------------------- 입력 파싱 (UI 없음) ---------------------
+# 페이지는 on_error=st.error로 불러 오류를 화면에 띄우고, 배치 실행(profiling/distributed CLI)과
+# 테스트는 on_error 없이 불러 InputError를 받는다. Streamlit 페이지를 import하지 않아도 된다.
+
+class InputError(ValueError):
+    pass
+
+def _report(message, on_error):
+    if on_error is None:
+        raise InputError(message)
+    on_error(message)
+
+def parse_teams(input_text, elo_key="Elo", on_error=None):
+    # league / k1 / romania: "팀이름 Elo 승점"
+    teams = {}
+    for line in input_text.strip().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != 3:
+            _report(f"팀 입력 형식 오류: '{line}' (팀이름 Elo 승점)", on_error)
+            return {}
+        name, elo, points = parts
+        try:
+            elo = float(elo)
+            points = int(points)
+        except ValueError:
+            _report(f"숫자 변환 오류: '{line}'", on_error)
+            return {}
+        teams[name] = {
+            elo_key: elo,
+            "승점": points,
+            "홈Elo보정": 60
+        }
+    return teams
+
+def parse_east_teams(input_text, on_error=None):
+    # east: "팀 Elo 현재승점 골득실"
+    teams = {}
+    for line in input_text.strip().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != 4:
+            _report(f"팀 입력 형식 오류: '{line}' (팀, Elo, 현재승점, 골득실)", on_error)
+            return {}
+        name, elo, pts, gd = parts
+        try:
+            teams[name] = {"Elo": float(elo), "승점": int(pts), "골득실": int(gd)}
+        except ValueError:
+            _report(f"숫자 변환 오류: '{line}'", on_error)
+            return {}
+    return teams
+
+def parse_matches(input_text, teams, on_error=None):
+    # "팀1 팀2" (팀1 홈)
+    matches = []
+    for line in input_text.strip().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != 2:
+            _report(f"경기 입력 형식 오류: '{line}'", on_error)
+            return []
+        team1, team2 = parts
+        if team1 not in teams or team2 not in teams:
+            _report(f"팀 이름 오류: '{team1}' 또는 '{team2}'가 등록된 팀이 아닙니다.", on_error)
+            return []
+        matches.append((team1, team2))
+    return matches
+
+# 포맷 이름 → (팀 파서, 추가 인자). 배치 실행이 vecsim.FORMATS와 함께 쓴다.
+FORMAT_PARSERS = {
+    "league": (parse_teams, {"elo_key": "Elo"}),
+    "k1": (parse_teams, {"elo_key": "기본Elo"}),
+    "romania": (parse_teams, {"elo_key": "기본Elo"}),
+    "east": (parse_east_teams, {}),
+}
+
+def parse_format(fmt, team_text, match_text):
+    parse, kwargs = FORMAT_PARSERS[fmt]
+    teams = parse(team_text, **kwargs)
+    matches = parse_matches(match_text, teams)
+    if not teams or not matches:
+        raise InputError("팀/경기 입력이 비어 있습니다.")
+    return teams, matches
+
+# --------------------- 녹아웃 대진표 입력 ---------------------
+BYE = "BYE"
+
+def parse_bracket(input_text, on_error=None):
+    # 대진표 순서대로 한 줄에 한 슬롯: "팀이름 Elo [시드]" 또는 "BYE" (시드가 없으면 입력 순서)
+    slots = []
+    for line in input_text.strip().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) == 1 and parts[0].upper() == BYE:
+            slots.append(None)
+            continue
+        if len(parts) not in (2, 3):
+            _report(f"팀 입력 형식 오류: '{line}' (팀이름 Elo [시드] 또는 BYE)", on_error)
+            return []
+        try:
+            elo = float(parts[1])
+            seed = int(parts[2]) if len(parts) == 3 else len(slots) + 1
+        except ValueError:
+            _report(f"숫자 변환 오류: '{line}'", on_error)
+            return []
+        # 결과 요약이 팀 이름을 키로 쓰므로 같은 이름은 받지 않는다
+        if any(s is not None and s["팀명"] == parts[0] for s in slots):
+            _report(f"중복된 팀 이름: '{parts[0]}'", on_error)
+            return []
+        slots.append({"팀명": parts[0], "Elo": elo, "시드": seed})
+    n = len(slots)
+    if n < 2 or n & (n - 1):
+        _report(f"슬롯 수({n})가 2의 거듭제곱이 아닙니다. 빈 자리는 BYE로 채우세요.", on_error)
+        return []
+    if sum(s is not None for s in slots) < 2:
+        _report("팀이 두 개 이상 필요합니다.", on_error)
+        return []
+    return slots
+
+# --------------------- elp (ClubElo 리플레이) 입력 ---------------------
+def parse_initial_elo(input_text, on_error=None):
+    # "팀이름 Elo 승점", 팀 이름에 공백 허용. 잘못된 줄은 건너뛴다
+    rows = []
+    for line in input_text.strip().splitlines():
+        parts = line.strip().split()
+        if not parts:
+            continue
+        if len(parts) < 3:
+            _report(f"형식: 팀이름 Elo 승점 → {line}", on_error)
+            continue
+        try:
+            rows.append((" ".join(parts[:-2]), float(parts[-2]), int(parts[-1])))
+        except ValueError:
+            _report(f"Elo/승점 숫자 오류: {line}", on_error)
+    return rows
+
+def parse_results(result_text, base_day, on_error=None):
+    # "[YYYY-MM-DD] 홈팀 2-1 원정팀" → (날짜 서수, 홈, 원정, 홈골, 원정골). 날짜가 없으면 base_day
+    results = []
+    for line in result_text.strip().splitlines():
+        if not line.strip():
+            continue
+        match = re.match(r"(?:(\d{4}-\d{2}-\d{2}) )?(.+?) (\d+)-(\d+) (.+)", line)
+        if not match:
+            _report(f"형식: [2024-03-02] 홈팀 2-1 원정팀 → {line}", on_error)
+            continue
+        day_text, home, hg, ag, away = match.groups()
+        try:
+            day = date.fromisoformat(day_text).toordinal() if day_text else base_day
+        except ValueError:
+            _report(f"날짜 오류: {line}", on_error)
+            continue
+        results.append((day, home.strip(), away.strip(), int(hg), int(ag), line))
+    return results
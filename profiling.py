@@ -0,0 +1,196 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# --------------------- 단계별 프로파일러 ---------------------
+# 각 시뮬레이터/Elo 리플레이가 단계(파싱, 경기확률, 대진생성, 샘플링, 정렬/순위, 집계, 요약)를
+# prof.phase("이름")으로 감싸면 벽시계 시간과 호출 수를 누적한다.
+# deep=True일 때만 tracemalloc(할당량)과 cProfile(함수별 통계)을 켠다.
+
+_NULL_PHASE = nullcontext()
+
+
+class SimProfiler:
+    def __init__(self, enabled=True, deep=False):
+        self.enabled = enabled
+        self.deep = deep
+        self.phases = {}
+        self.n_sims = 0
+        self.total_wall = 0.0
+        self.cprofile_text = ""
+        self._cprof = None
+        self._started_at = None
+        self._own_tracemalloc = False
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        stat = self.phases.setdefault(name, {"호출수": 0, "시간(s)": 0.0, "순할당(B)": 0, "최대할당(B)": 0})
+        if self.deep:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            stat["시간(s)"] += time.perf_counter() - t0
+            stat["호출수"] += 1
+            if self.deep:
+                after, peak = tracemalloc.get_traced_memory()
+                stat["순할당(B)"] += after - before
+                stat["최대할당(B)"] = max(stat["최대할당(B)"], peak - before)
+
+    def start(self):
+        if not self.enabled:
+            return self
+        if self.deep:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._own_tracemalloc = True
+            self._cprof = cProfile.Profile()
+            self._cprof.enable()
+        self._started_at = time.perf_counter()
+        return self
+
+    def stop(self):
+        if not self.enabled or self._started_at is None:
+            return self
+        self.total_wall += time.perf_counter() - self._started_at
+        self._started_at = None
+        if self._cprof is not None:
+            self._cprof.disable()
+            buf = io.StringIO()
+            pstats.Stats(self._cprof, stream=buf).sort_stats("cumulative").print_stats(25)
+            self.cprofile_text = buf.getvalue()
+            self._cprof = None
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+            self._own_tracemalloc = False
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def add_sims(self, n):
+        self.n_sims += n
+
+    def report(self):
+        phases = {}
+        phase_total = sum(s["시간(s)"] for s in self.phases.values()) or 1.0
+        for name, s in self.phases.items():
+            phases[name] = dict(s, **{"비중(%)": s["시간(s)"] / phase_total * 100})
+        return {
+            "총시간(s)": self.total_wall,
+            "시뮬레이션수": self.n_sims,
+            "초당시뮬레이션": self.n_sims / self.total_wall if self.total_wall > 0 else 0.0,
+            "단계별": phases,
+            "상세모드": self.deep,
+        }
+
+    def to_json(self, include_cprofile=True):
+        data = self.report()
+        if include_cprofile and self.cprofile_text:
+            data["cProfile"] = self.cprofile_text
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+NULL_PROFILER = SimProfiler(enabled=False)
+
+
+def get_profiler(prof):
+    return prof if prof is not None else NULL_PROFILER
+
+
+# --------------------- Streamlit 사이드바 ---------------------
+def sidebar_options(key_prefix=""):
+    import streamlit as st
+    st.sidebar.markdown("### ⏱️ 프로파일링")
+    enabled = st.sidebar.checkbox("단계별 시간 측정", value=False, key=f"{key_prefix}prof_on")
+    deep = st.sidebar.checkbox("cProfile/tracemalloc 상세 측정 (느림)", value=False,
+                               key=f"{key_prefix}prof_deep", disabled=not enabled)
+    return SimProfiler(enabled=enabled, deep=enabled and deep)
+
+
+def render_sidebar(prof):
+    if not prof.enabled:
+        return
+    import streamlit as st
+    import pandas as pd
+    rep = prof.report()
+    st.sidebar.write(f"**총 시간:** {rep['총시간(s)']:.3f}s, **초당 시뮬레이션:** {rep['초당시뮬레이션']:,.0f}")
+    rows = []
+    for name, s in rep["단계별"].items():
+        row = {"단계": name, "시간(s)": round(s["시간(s)"], 4), "비중(%)": round(s["비중(%)"], 1), "호출수": s["호출수"]}
+        if prof.deep:
+            row["순할당(KB)"] = round(s["순할당(B)"] / 1024, 1)
+            row["최대할당(KB)"] = round(s["최대할당(B)"] / 1024, 1)
+        rows.append(row)
+    st.sidebar.dataframe(pd.DataFrame(rows), use_container_width=True)
+    if prof.cprofile_text:
+        with st.sidebar.expander("cProfile 상위 함수"):
+            st.text(prof.cprofile_text)
+    st.sidebar.download_button("프로파일 JSON 다운로드", prof.to_json(), file_name="profile.json", mime="application/json")
+
+
+# --------------------- 배치 실행 (JSON 출력) ---------------------
+# Streamlit 페이지를 import하지 않는다: 입력은 parsers, 시뮬레이션은 vecsim.FORMATS, 리플레이는 clubelo
+# 예: python profiling.py league teams.txt matches.txt --sims 10000 --deep -o profile.json
+#     python profiling.py elp initial_elo.txt results.txt --date 2024-08-01
+def _run_batch(argv):
+    import argparse
+    from datetime import date
+    from clubelo import replay
+    from distributions import run_summary
+    from parsers import InputError, parse_format
+    from vecsim import FORMATS
+    parser = argparse.ArgumentParser(description="시뮬레이터/Elo 리플레이 단계별 프로파일 (JSON 출력)")
+    parser.add_argument("format", choices=list(FORMATS) + ["elp"])
+    parser.add_argument("teams_file", help="팀 입력 (elp는 초기 Elo 입력)")
+    parser.add_argument("matches_file", help="남은 경기 (elp는 경기 결과)")
+    parser.add_argument("--sims", type=int, default=1000)
+    parser.add_argument("--date", type=date.fromisoformat, help="elp: 날짜 없는 입력의 기준 날짜 (기본 오늘)")
+    parser.add_argument("--deep", action="store_true")
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+
+    with open(args.teams_file, encoding="utf-8") as f:
+        team_text = f.read()
+    with open(args.matches_file, encoding="utf-8") as f:
+        match_text = f.read()
+
+    prof = SimProfiler(enabled=True, deep=args.deep)
+    try:
+        with prof:
+            if args.format == "elp":
+                replay(team_text, match_text, args.date, prof=prof)
+            else:
+                with prof.phase("파싱"):
+                    teams, matches = parse_format(args.format, team_text, match_text)
+                simulate, fmt_kwargs = FORMATS[args.format]
+                run_summary(simulate, teams, matches, args.sims, prof=prof,
+                            shared_first=args.format == "league", **fmt_kwargs)
+    except (InputError, ValueError) as e:
+        raise SystemExit(f"입력 오류: {e}")
+    out = prof.to_json()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    _run_batch(sys.argv[1:])
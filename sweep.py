@@ -0,0 +1,150 @@
+import numpy as np
+from itertools import product
+from profiling import get_profiler
+from vecsim import CHUNK_SIMS, FORMAT_PARAMS, FORMATS, K_VALUE, MODEL_PARAMS, SharedRandom, iter_chunks, rank_counts
+
+# --------------------- 파라미터 스윕 (민감도 분석) ---------------------
+# 모든 설정을 한 번에: 설정 축을 시뮬레이션 축 앞에 붙여 (설정 수 × 시뮬 수)개를 한 배열로 돌리고,
+# SharedRandom으로 모든 설정이 같은 난수를 쓰게 한다 (공통 난수법).
+
+def check_grid(fmt, grid):
+    # 포맷이 쓰지 않는 파라미터는 설정만 늘리고 결과는 모두 같으므로 받지 않는다
+    allowed = FORMAT_PARAMS[fmt]
+    for name in grid:
+        if name not in allowed:
+            raise ValueError(f"'{fmt}' 포맷에서 쓰지 않는 파라미터: '{name}' (가능: {', '.join(allowed)})")
+
+def parse_grid(txt, fmt=None):
+    # 한 줄에 "파라미터 값1 값2 ..." (예: 홈Elo보정 40 60 80)
+    allowed = FORMAT_PARAMS[fmt] if fmt else MODEL_PARAMS
+    grid = {}
+    for line in txt.strip().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        name, values = parts[0], parts[1:]
+        if name not in allowed:
+            raise ValueError(f"알 수 없는 파라미터: '{name}' (가능: {', '.join(allowed)})")
+        if not values:
+            raise ValueError(f"값이 없습니다: '{line}'")
+        grid[name] = [float(v) for v in values]
+    return grid
+
+def expand_grid(grid):
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in product(*(grid[k] for k in keys))]
+
+def config_label(cfg):
+    return ", ".join(f"{k}={v:g}" for k, v in cfg.items()) or "기본"
+
+def run_sweep(fmt, teams, matches, n_sims, grid, dynamic_elo=False, k_value=K_VALUE, rng=None, prof=None):
+    check_grid(fmt, grid)
+    prof = get_profiler(prof)
+    rng = np.random.default_rng() if rng is None else rng
+    simulate, fmt_kwargs = FORMATS[fmt]
+    configs = expand_grid(grid) or [{}]
+    n_cfg = len(configs)
+    names = list(teams.keys())
+    n_teams = len(names)
+    rank_count = np.zeros((n_cfg, n_teams, n_teams), dtype=np.int64)
+    point_sum = np.zeros((n_cfg, n_teams), dtype=np.int64)
+    shared = SharedRandom(rng, n_cfg)
+    params = {key: np.array([cfg[key] for cfg in configs])[:, None] for key in grid}
+    # 한 청크의 배열 크기가 설정 수와 무관하게 CHUNK_SIMS 행 안팎이 되도록
+    for n_chunk in iter_chunks(n_sims, max(1, CHUNK_SIMS // n_cfg)):
+        sim = simulate(shared, teams, matches, n_cfg * n_chunk, dynamic_elo=dynamic_elo, k_value=k_value,
+                       params=params, prof=prof, **fmt_kwargs)
+        with prof.phase("집계"):
+            rank = sim["rank"].reshape(n_cfg, n_chunk, n_teams)
+            for i in range(n_cfg):
+                rank_count[i] += rank_counts(rank[i])
+            point_sum += sim["points"].reshape(n_cfg, n_chunk, n_teams).sum(axis=1)
+    prof.add_sims(n_sims * n_cfg)
+    with prof.phase("요약"):
+        rank_probs = rank_count / n_sims * 100
+        mean_points = point_sum / n_sims
+        results = []
+        for i, cfg in enumerate(configs):
+            results.append({
+                "설정": cfg,
+                "순위별확률(%)": {team: rank_probs[i, j].tolist() for j, team in enumerate(names)},
+                "평균승점": {team: float(mean_points[i, j]) for j, team in enumerate(names)},
+            })
+    return results
+
+def sensitivity_table(results, grid, names, top_n=1):
+    # 파라미터마다 (다른 파라미터는 모든 값에 걸쳐 평균한) 주효과:
+    # 값별 상위 top_n위 확률 / 평균순위의 최소~최대 폭과 1차 회귀 기울기
+    rows = []
+    n_teams = len(names)
+    for key, values in grid.items():
+        if len(values) < 2:
+            continue
+        xs = np.array([r["설정"][key] for r in results])
+        for team in names:
+            top = np.array([sum(r["순위별확률(%)"][team][:top_n]) for r in results])
+            mean_rank = np.array([np.dot(r["순위별확률(%)"][team], np.arange(1, n_teams + 1)) / 100 for r in results])
+            top_by_value = [top[xs == v].mean() for v in values]
+            rank_by_value = [mean_rank[xs == v].mean() for v in values]
+            rows.append({
+                "파라미터": key,
+                "팀명": team,
+                f"상위{top_n}위 확률 최소(%)": min(top_by_value),
+                f"상위{top_n}위 확률 최대(%)": max(top_by_value),
+                f"상위{top_n}위 확률 기울기": float(np.polyfit(values, top_by_value, 1)[0]),
+                "평균순위 최소": min(rank_by_value),
+                "평균순위 최대": max(rank_by_value),
+                "평균순위 기울기": float(np.polyfit(values, rank_by_value, 1)[0]),
+            })
+    return rows
+
+# --------------------- Streamlit 패널 ---------------------
+DEFAULT_GRID = {
+    "league": "홈Elo보정 40 60 80\nElo배율 1.0 1.2 1.4",
+    "k1": "홈Elo보정 40 60 80\nElo배율 1.0 1.2 1.4",
+    "romania": "홈Elo보정 40 60 80\nElo배율 1.0 1.2 1.4",
+    "east": "무승부율 0.20 0.24 0.28",
+}
+
+def render_sweep_panel(fmt, parse_teams, parse_matches, team_text, match_text, dynamic_elo=False, k_value=K_VALUE):
+    import streamlit as st
+    import pandas as pd
+    with st.expander("🧪 파라미터 민감도 분석 (스윕)"):
+        st.caption("한 줄에 '파라미터 값1 값2 ...'. 가능한 파라미터: " + ", ".join(
+            f"{k}(기본 {MODEL_PARAMS[k]})" for k in FORMAT_PARAMS[fmt]))
+        grid_text = st.text_area("파라미터 그리드", value=DEFAULT_GRID[fmt], height=100, key=f"{fmt}_sweep_grid")
+        sweep_sims = st.number_input("설정당 시뮬레이션 횟수", min_value=100, value=2000, step=100, key=f"{fmt}_sweep_sims")
+        top_n = st.number_input("관심 순위 (상위 N위)", min_value=1, value=1, step=1, key=f"{fmt}_sweep_top")
+        if not st.button("스윕 실행", key=f"{fmt}_sweep_run"):
+            return
+        teams = parse_teams(team_text)
+        if not teams:
+            return
+        matches = parse_matches(match_text, teams)
+        if not matches:
+            return
+        try:
+            grid = parse_grid(grid_text, fmt)
+        except ValueError as e:
+            st.error(f"그리드 입력 오류: {e}")
+            return
+        results = run_sweep(fmt, teams, matches, int(sweep_sims), grid, dynamic_elo=dynamic_elo, k_value=k_value)
+        names = list(teams.keys())
+
+        st.markdown("#### 설정별 상위 순위 확률 (%)")
+        rows = [{"설정": config_label(r["설정"]),
+                 **{team: round(sum(r["순위별확률(%)"][team][:int(top_n)]), 2) for team in names}}
+                for r in results]
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+        st.markdown("#### 파라미터별 민감도")
+        st.dataframe(pd.DataFrame(sensitivity_table(results, grid, names, int(top_n))).round(3),
+                     use_container_width=True)
+
+        st.markdown("#### 설정별 전체 순위 확률표 (%)")
+        for tab, r in zip(st.tabs([config_label(r["설정"]) for r in results]), results):
+            tab.dataframe(pd.DataFrame([
+                {"팀명": team, "평균승점": round(r["평균승점"][team], 2),
+                 **{f"{i+1}위": round(p, 2) for i, p in enumerate(r["순위별확률(%)"][team])}}
+                for team in names
+            ]), use_container_width=True)
@@ -0,0 +1,13 @@
+import os
+import sys
+
+# 시뮬레이터 모듈은 저장소 최상위에 있다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_league(n_teams=8, every=3):
+    # 모든 포맷이 읽는 키(Elo/기본Elo/승점/골득실/홈Elo보정)를 갖춘 팀과, 홈/원정 전체 대진 중 every번째마다 고른 경기
+    teams = {f"T{i}": {"Elo": 1500.0 + 25 * i, "기본Elo": 1500.0 + 25 * i, "승점": 3 * i,
+                       "골득실": i - n_teams // 2, "홈Elo보정": 60} for i in range(n_teams)}
+    matches = [(f"T{i}", f"T{j}") for i in range(n_teams) for j in range(n_teams) if i != j][::every]
+    return teams, matches
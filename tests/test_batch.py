@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TEAM_TEXT = "\n".join(f"T{i} {1500 + 25 * i} {3 * i} {i - 4}" for i in range(8))
+MATCH_TEXT = "\n".join(f"T{i} T{j}" for i in range(8) for j in range(8) if i != j)
+INIT_TEXT = "Real Madrid 1800 10\nBarca 1790 9\n"
+RESULT_TEXT = "2024-03-02 Real Madrid 2-1 Barca\n2024-03-09 Barca 0-0 Real Madrid\n"
+PAGES = ["league", "k1", "romania", "east", "elp", "streamlit"]
+
+
+def run_batch(tmp_path, fmt, team_text, match_text, *args):
+    teams_file = tmp_path / "teams.txt"
+    matches_file = tmp_path / "matches.txt"
+    teams_file.write_text(team_text, encoding="utf-8")
+    matches_file.write_text(match_text, encoding="utf-8")
+    # 배치 실행은 UI 페이지(와 streamlit)를 import하지 않아야 한다
+    code = ("import sys, profiling; profiling._run_batch(sys.argv[1:]); "
+            f"print(','.join(m for m in {PAGES!r} if m in sys.modules), file=sys.stderr)")
+    proc = subprocess.run([sys.executable, "-c", code, fmt, str(teams_file), str(matches_file), *args],
+                          cwd=ROOT, capture_output=True, text=True, encoding="utf-8", check=True)
+    assert proc.stderr.strip() == ""
+    return json.loads(proc.stdout)
+
+
+@pytest.mark.parametrize("fmt", ["league", "k1", "romania", "east"])
+def test_batch_profile_records_phases(tmp_path, fmt):
+    team_text = TEAM_TEXT if fmt == "east" else "\n".join(l.rsplit(" ", 1)[0] for l in TEAM_TEXT.splitlines())
+    report = run_batch(tmp_path, fmt, team_text, MATCH_TEXT, "--sims", "200")
+    assert report["시뮬레이션수"] == 200
+    for phase in ("파싱", "경기확률", "샘플링", "정렬/순위", "집계", "요약"):
+        assert phase in report["단계별"]
+
+
+def test_batch_elp_replay(tmp_path):
+    report = run_batch(tmp_path, "elp", INIT_TEXT, RESULT_TEXT, "--date", "2024-03-01")
+    assert report["시뮬레이션수"] == 2
+    assert set(report["단계별"]) == {"파싱", "Elo갱신"}
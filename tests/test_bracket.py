@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from bracket import MODELS, TIEBREAKS, bracket_probabilities, round_win_matrices, run_bracket, tie_win_matrices
+from parsers import InputError, parse_bracket
+
+BRACKET = "Ulsan 1750 3\nGangwon 1690 4\nBucheon 1560 5\nBYE\nJeonbuk 1700 1\nBYE\nPohang 1680 2\nSuwon 1600 6"
+
+
+@pytest.mark.parametrize("model, tiebreak, neutral", list(itertools.product(MODELS, TIEBREAKS, [False, True])))
+def test_tie_matrices_are_complementary(model, tiebreak, neutral):
+    elo = np.array([1750.0, 1690.0, 1560.0, 1700.0, 1600.0])
+    seed = np.array([3, 4, 5, 1, 1])
+    for W in tie_win_matrices(elo, seed, model, tiebreak=tiebreak, neutral=neutral):
+        total = W + W.T
+        off_diagonal = ~np.eye(len(elo), dtype=bool)
+        np.testing.assert_allclose(total[off_diagonal], 1.0)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_bracket_with_byes_and_two_legged_round_sums_to_one_title(model):
+    slots = parse_bracket(BRACKET)
+    summary = run_bracket(slots, model=model, two_legged_rounds={1})
+    assert sum(res["우승확률(%)"] for res in summary.values()) == pytest.approx(100.0)
+    # 8강에서 BYE를 만난 팀은 4강에 반드시 진출
+    assert summary["Bucheon"]["라운드별진출(%)"][0] == pytest.approx(100.0)
+    for res in summary.values():
+        assert np.all(np.diff(res["라운드별진출(%)"]) <= 1e-12)
+
+
+def test_bracket_matches_monte_carlo():
+    slots = parse_bracket(BRACKET)
+    win_by_round = round_win_matrices(slots, model=MODELS[1], two_legged_rounds={1})
+    exact = bracket_probabilities(win_by_round)[-1]
+    rng = np.random.default_rng(0)
+    n_runs = 100_000
+    alive = np.tile(np.arange(len(slots)), (n_runs, 1))
+    for W in win_by_round:
+        a, b = alive[:, 0::2], alive[:, 1::2]
+        alive = np.where(rng.random(a.shape) < W[a, b], a, b)
+    champions = np.bincount(alive[:, 0], minlength=len(slots)) / n_runs
+    np.testing.assert_allclose(champions, exact, atol=0.005)
+
+
+def test_parse_bracket_skips_blank_lines_and_rejects_duplicates():
+    slots = parse_bracket("A 1600\n\nB 1500\n   \nBYE\nD 1450\n")
+    assert [s and s["시드"] for s in slots] == [1, 2, None, 4]
+    with pytest.raises(InputError, match="중복"):
+        parse_bracket("A 1600\nB 1500\nA 1550\nD 1450")
+    with pytest.raises(InputError):
+        parse_bracket("A 1600\nB 1500\nC 1550")
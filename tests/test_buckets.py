@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import vecsim
+from conftest import make_league
+from sweep import run_sweep
+from vecsim import simulate_k1_split, simulate_romania
+
+TEAMS, MATCHES = make_league(n_teams=10, every=4)
+SIMULATORS = {"k1": simulate_k1_split, "romania": simulate_romania}
+
+
+@pytest.fixture
+def buckets_off(monkeypatch):
+    # 버킷 표를 끄면 스플릿 경기 확률을 시뮬레이션마다 직접 계산한다
+    def off():
+        monkeypatch.setattr(vecsim, "split_buckets", lambda *a, **k: None)
+    return off
+
+
+@pytest.fixture
+def bucket_calls(monkeypatch):
+    # 버킷 경로가 실제로 쓰였는지 확인 (None이면 비교가 의미 없다)
+    calls = []
+    split_buckets = vecsim.split_buckets
+
+    def spy(*args, **kwargs):
+        buckets = split_buckets(*args, **kwargs)
+        calls.append(buckets is not None)
+        return buckets
+    monkeypatch.setattr(vecsim, "split_buckets", spy)
+    return calls
+
+
+@pytest.mark.parametrize("fmt", ["k1", "romania"])
+def test_split_buckets_match_per_sim_probabilities(fmt, bucket_calls, buckets_off):
+    simulate = SIMULATORS[fmt]
+    on = simulate(np.random.default_rng(5), TEAMS, MATCHES, 2000)
+    assert bucket_calls and all(bucket_calls)
+    buckets_off()
+    off = simulate(np.random.default_rng(5), TEAMS, MATCHES, 2000)
+    for key in ("points", "rank"):
+        np.testing.assert_array_equal(on[key], off[key])
+
+
+@pytest.mark.parametrize("fmt", ["k1", "romania"])
+def test_split_buckets_match_per_sim_in_sweep(fmt, bucket_calls, buckets_off):
+    grid = {"홈Elo보정": [40.0, 80.0], "Elo배율": [1.0, 1.4]}
+    on = run_sweep(fmt, TEAMS, MATCHES, 1200, grid, rng=np.random.default_rng(2))
+    assert bucket_calls and all(bucket_calls)
+    buckets_off()
+    off = run_sweep(fmt, TEAMS, MATCHES, 1200, grid, rng=np.random.default_rng(2))
+    assert [r["순위별확률(%)"] for r in on] == [r["순위별확률(%)"] for r in off]
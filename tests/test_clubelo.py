@@ -0,0 +1,45 @@
+from datetime import date
+
+import pytest
+
+from clubelo import EloReplay, replay
+from parsers import parse_initial_elo, parse_results
+from vecsim import elo_change
+
+INIT_TEXT = "Real Madrid 1800 10\nBarca 1790 9\n"
+RESULT_TEXT = "2024-03-02 Real Madrid 2-1 Barca\n2024-03-09 Barca 0-0 Real Madrid\n"
+
+
+def test_initial_ratings_default_to_first_result_date():
+    # 기준 날짜 기본값(오늘)으로 초기 Elo를 넣어도 과거 날짜 결과가 순서 오류로 막히지 않아야 한다
+    state = replay(INIT_TEXT, RESULT_TEXT)
+    assert state.n_results == 2
+    assert state.points["Real Madrid"] == 14
+    first = date(2024, 3, 2).toordinal()
+    assert state.history.as_of(first - 1) == {}
+    assert state.history.as_of(first)["Barca"][2] == 9
+    assert state.history.last_date == date(2024, 3, 9).toordinal()
+
+
+def test_initial_ratings_before_results_keep_their_date():
+    state = replay(INIT_TEXT, RESULT_TEXT, base_date=date(2024, 1, 1))
+    assert state.history.as_of(date(2024, 1, 1).toordinal())["Real Madrid"] == (1800.0, 1.0, 10)
+
+
+def test_results_out_of_order_are_still_rejected():
+    state = EloReplay()
+    state.set_initial(parse_initial_elo(INIT_TEXT))
+    results = parse_results(RESULT_TEXT, date.today().toordinal())
+    state.apply_results(results)
+    with pytest.raises(ValueError):
+        state.apply_results(parse_results("2024-03-05 Real Madrid 1-0 Barca", date.today().toordinal()))
+    with pytest.raises(ValueError):
+        state.set_initial(parse_initial_elo("Sevilla 1700 5"), base_date=date(2024, 3, 1))
+
+
+def test_replay_update_matches_simulation_elo_change():
+    # elp 리플레이와 동적 Elo 시뮬레이션은 같은 ClubElo 식을 쓴다
+    state = replay(INIT_TEXT, "2024-03-02 Real Madrid 4-1 Barca")
+    change = float(elo_change(1800.0, 1790.0, 1.0, 3))
+    assert state.elos["Real Madrid"] == pytest.approx(1800.0 + change)
+    assert state.elos["Barca"] == pytest.approx(1790.0 - change)
@@ -0,0 +1,114 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from conftest import make_league
+from distributed import Coordinator, run_shard
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAMS, MATCHES = make_league(every=4)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_workers(url, n):
+    return [subprocess.Popen([sys.executable, "distributed.py", "worker", url, "--poll-interval", "0.05"],
+                             cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for _ in range(n)]
+
+
+def clean_summary(seed, n_sims=3000, **kwargs):
+    coordinator = Coordinator("k1", TEAMS, MATCHES, n_sims, shard_sims=500, seed=seed, **kwargs)
+    while True:
+        spec = coordinator.next_shard()
+        if "shard_id" not in spec:
+            return coordinator.summary()
+        coordinator.submit(json.loads(json.dumps(run_shard(spec))))
+
+
+def test_workers_recover_abandoned_and_failed_shards():
+    coordinator = Coordinator("k1", TEAMS, MATCHES, 3000, shard_sims=500, seed=7, lease_timeout=1.0)
+    server = coordinator.serve("127.0.0.1", free_port())
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    workers = []
+    try:
+        # 하나는 가져가고 응답하지 않음(임대 만료), 하나는 /fail로 포기
+        coordinator.next_shard()
+        failed = coordinator.next_shard()
+        req = urllib.request.Request(url + "/fail", data=json.dumps({"shard_id": failed["shard_id"]}).encode(),
+                                     headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(req).read()
+        workers = start_workers(url, 2)
+        assert coordinator.finished.wait(60)
+        # 임대 만료는 재배정만 하고 실패로 세지 않는다
+        assert coordinator.attempts == {failed["shard_id"]: 1}
+        assert coordinator.redispatched >= 2
+        assert coordinator.summary() == clean_summary(7)
+    finally:
+        server.shutdown()
+        server.server_close()
+        for w in workers:
+            w.wait(30)
+
+
+def test_lease_expiries_do_not_abort_slow_shards():
+    # 느린 워커: 임대가 max_attempts번 넘게 만료돼도 중단하지 않고, 늦게 온 결과를 받아들인다
+    coordinator = Coordinator("k1", TEAMS, MATCHES, 500, shard_sims=500, seed=3, lease_timeout=0.01, max_attempts=1)
+    spec = coordinator.next_shard()
+    for _ in range(3):
+        time.sleep(0.02)
+        assert coordinator.next_shard()["shard_id"] == spec["shard_id"]
+    assert coordinator.submit(json.loads(json.dumps(run_shard(spec))))
+    assert coordinator.finished.is_set() and coordinator.aborted is None
+    assert coordinator.summary() == clean_summary(3, n_sims=500)
+
+
+def test_run_reclaims_leases_when_all_workers_died():
+    port = free_port()
+    coordinator = Coordinator("k1", TEAMS, MATCHES, 1000, shard_sims=500, seed=5, lease_timeout=0.2)
+    # 두 샤드를 가져간 워커가 모두 죽었다 → 아무도 /shard를 부르지 않아도 run 루프가 대기열로 돌린다
+    coordinator.next_shard()
+    coordinator.next_shard()
+    result = {}
+    runner = threading.Thread(target=lambda: result.update(coordinator.run("127.0.0.1", port)), daemon=True)
+    runner.start()
+    workers = []
+    try:
+        deadline = time.monotonic() + 10
+        while coordinator.status()["pending"] < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        workers = start_workers(f"http://127.0.0.1:{port}", 1)
+        runner.join(60)
+        assert not runner.is_alive()
+        assert result == clean_summary(5, n_sims=1000)
+    finally:
+        for w in workers:
+            if runner.is_alive():
+                w.kill()
+            w.wait(30)
+
+
+def test_deterministic_shard_failure_aborts():
+    # 알 수 없는 시뮬레이터 옵션 → 모든 시도가 TypeError
+    port = free_port()
+    coordinator = Coordinator("k1", TEAMS, MATCHES, 1000, shard_sims=500, seed=1,
+                              options={"bogus": True}, max_attempts=2)
+    workers = start_workers(f"http://127.0.0.1:{port}", 2)
+    try:
+        with pytest.raises(RuntimeError, match="2번 실패"):
+            coordinator.run("127.0.0.1", port)
+    finally:
+        for w in workers:
+            assert w.wait(30) == 0
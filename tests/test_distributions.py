@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from conftest import make_league
+from distributions import SimAccumulator, run_summary
+from vecsim import FORMATS
+
+TEAMS, MATCHES = make_league()
+
+
+@pytest.mark.parametrize("fmt", list(FORMATS))
+def test_run_summary_is_reproducible_and_normalised(fmt):
+    simulate, fmt_kwargs = FORMATS[fmt]
+    runs = [run_summary(simulate, TEAMS, MATCHES, 500, rng=np.random.default_rng(4), **fmt_kwargs)
+            for _ in range(2)]
+    assert runs[0] == runs[1]
+    for res in runs[0].values():
+        assert sum(res["순위별확률(%)"]) == pytest.approx(100.0)
+        assert sum(res["승점분포(%)"].values()) == pytest.approx(100.0)
+
+
+def test_merged_json_accumulators_match_one_accumulator():
+    # 분산 샤드처럼 JSON으로 오간 누적기를 합쳐도 같은 시뮬레이션을 한 번에 누적한 것과 같다
+    simulate, fmt_kwargs = FORMATS["east"]
+    sims = [simulate(np.random.default_rng(seed), TEAMS, MATCHES, 300, **fmt_kwargs) for seed in (1, 2)]
+    whole = SimAccumulator(TEAMS)
+    merged = SimAccumulator(TEAMS)
+    for sim in sims:
+        whole.add(sim)
+        part = SimAccumulator(TEAMS)
+        part.add(sim)
+        merged.merge(SimAccumulator.from_json(part.to_json()))
+    assert merged.summary() == whole.summary()
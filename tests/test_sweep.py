@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from conftest import make_league
+from sweep import parse_grid, run_sweep
+from vecsim import FORMAT_PARAMS, MODEL_PARAMS
+
+TEAMS, MATCHES = make_league()
+
+
+@pytest.mark.parametrize("fmt", ["league", "k1", "romania", "east"])
+def test_each_single_parameter_grid_runs(fmt):
+    # 파라미터 하나만 스윕해도 (값 하나짜리 그리드 포함) 확률 배열 모양이 맞아야 한다
+    for name in FORMAT_PARAMS[fmt]:
+        default = MODEL_PARAMS[name]
+        for values in ([0.9 * default, 1.1 * default], [default]):
+            results = run_sweep(fmt, TEAMS, MATCHES, 50, {name: values}, rng=np.random.default_rng(0))
+            assert len(results) == len(values)
+            for r in results:
+                for probs in r["순위별확률(%)"].values():
+                    assert sum(probs) == pytest.approx(100.0)
+
+
+@pytest.mark.parametrize("fmt", ["league", "k1", "romania", "east"])
+def test_unused_parameters_are_rejected(fmt):
+    unused = "홈Elo보정" if fmt == "east" else "무승부율"
+    with pytest.raises(ValueError):
+        parse_grid(f"{unused} 0.2 0.3", fmt)
+    with pytest.raises(ValueError):
+        run_sweep(fmt, TEAMS, MATCHES, 10, {unused: [0.2, 0.3]})
+
+
+def test_dynamic_sweep_uses_k_value():
+    grid = {"홈Elo보정": [60.0]}
+    runs = [run_sweep("league", TEAMS, MATCHES, 500, grid, dynamic_elo=True, k_value=k,
+                      rng=np.random.default_rng(1))[0]["순위별확률(%)"] for k in (16, 16, 64)]
+    assert runs[0] == runs[1]
+    assert runs[0] != runs[2]
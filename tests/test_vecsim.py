@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+from conftest import make_league
+from vecsim import simulate_k1_split, simulate_romania
+
+
+@pytest.mark.parametrize("simulate", [simulate_k1_split, simulate_romania])
+@pytest.mark.parametrize("n_teams", [4, 5])
+@pytest.mark.parametrize("dynamic_elo", [False, True])
+def test_split_formats_handle_small_leagues(simulate, n_teams, dynamic_elo):
+    # 팀이 n_top(6)보다 적으면 모두 상위 그룹에서 스플릿을 치른다
+    teams, matches = make_league(n_teams=n_teams, every=1)
+    result = simulate(np.random.default_rng(0), teams, matches, 200, dynamic_elo=dynamic_elo)
+    assert result["rank"].shape == (200, n_teams)
+    assert (np.sort(result["rank"], axis=1) == np.arange(n_teams)).all()
@@ -0,0 +1,470 @@
+import numpy as np
+from itertools import combinations, permutations
+from profiling import get_profiler
+
+# --------------------- 설정값 ---------------------
+# ClubElo 방식 상수: 동적 Elo 갱신과 elp.py 리플레이(clubelo.py)가 함께 쓴다
+K_VALUE = 16
+HFA = 50.0
+# 한 번에 배열로 돌리는 시뮬레이션 수 (메모리 상한)
+CHUNK_SIMS = 20_000
+
+# --------------------- 승/무/패 확률 (league/k1/romania 모델, 배열 버전) ---------------------
+# 무승부 확률 구간: Elo 차 0 → 0.26, 100 → 0.23 (그 사이 선형), 100~300 → 0.18, 300 이상 → 0.15
+DRAW_BANDS = (0.26, 0.23, 0.18, 0.15)
+
+# 민감도 분석(sweep.py)에서 바꿀 수 있는 모델 상수와 기본값
+MODEL_PARAMS = {
+    "홈Elo보정": 60.0,
+    "Elo배율": 1.2,
+    "p": 1.0,
+    "무승부_0": DRAW_BANDS[0],
+    "무승부_100": DRAW_BANDS[1],
+    "무승부_100_300": DRAW_BANDS[2],
+    "무승부_300": DRAW_BANDS[3],
+    "무승부율": 0.24,  # east
+}
+
+def win_prob(elo1, elo2, elo_scale=1.2):
+    diff = (elo2 - elo1) * elo_scale
+    return 1 / (1 + 10 ** (diff / 400))
+
+def draw_probability(elo1, elo2, bands=DRAW_BANDS):
+    d0, d100, d_mid, d300 = bands
+    diff = np.abs(elo1 - elo2)
+    return np.where(diff >= 300, d300, np.where(diff >= 100, d_mid, d0 - (diff / 100) * (d0 - d100)))
+
+def match_probabilities(elo_home, elo_away, home_bonus=60, p=1, elo_scale=1.2, bands=DRAW_BANDS):
+    elo1 = elo_home + home_bonus
+    elo2 = elo_away
+    base_win_prob = win_prob(elo1, elo2, elo_scale)
+    base_lose_prob = 1 - base_win_prob
+    draw_prob = draw_probability(elo1, elo2, bands)
+    win_prob_adj = base_win_prob ** p
+    lose_prob_adj = base_lose_prob ** (1 / p)
+    total = win_prob_adj + lose_prob_adj
+    win_prob_final = win_prob_adj / total * (1 - draw_prob)
+    lose_prob_final = lose_prob_adj / total * (1 - draw_prob)
+    return win_prob_final, draw_prob, lose_prob_final
+
+def _model_kwargs(params, team_home_bonus, n_rows=None):
+    # params: MODEL_PARAMS 키 → 스칼라 또는 (설정 수, 1) 배열. 없는 키는 기본 모델 그대로.
+    # 시뮬레이션 행은 설정 순서대로 이어 붙어 있으며(설정0의 시뮬들, 설정1의 시뮬들, ...),
+    # n_rows를 주면 설정 값을 행 수만큼 펼친다.
+    params = dict(params or {})
+    if n_rows is not None:
+        params = {key: _expand_rows(value, n_rows) for key, value in params.items()}
+    return {
+        "home_bonus": params.get("홈Elo보정", team_home_bonus),
+        "p": params.get("p", MODEL_PARAMS["p"]),
+        "elo_scale": params.get("Elo배율", MODEL_PARAMS["Elo배율"]),
+        "bands": tuple(params.get(key, default) for key, default in
+                       zip(("무승부_0", "무승부_100", "무승부_100_300", "무승부_300"), DRAW_BANDS)),
+    }
+
+def _expand_rows(value, n_rows):
+    if np.ndim(value) == 0:
+        return value
+    return np.repeat(value, n_rows // len(value), axis=0)
+
+# --------------------- east 모델 (골 단위) ---------------------
+def elo_win_prob(elo_A, elo_B, k=400):
+    return 1 / (1 + 10 ** ((elo_B - elo_A) / k))
+
+def simulate_scores(rng, elo_A, elo_B, draw_rate=0.24):
+    return sample_scores(rng, elo_win_prob(elo_A, elo_B), draw_rate)
+
+def sample_scores(rng, P, draw_rate=0.24):
+    # P: A 기준 Elo 승리 기대값 (elo_win_prob)
+    d = draw_rate
+    shape = np.shape(P)
+    r = rng.random(shape)
+    draw_goals = rng.integers(0, 3, shape)          # (0,0) (1,1) (2,2)
+    margin = rng.integers(1, 4, shape)              # 1~3골 차
+    loser_goals = (rng.random(shape) * margin).astype(np.int64)  # 0 ~ margin-1
+    p_A = np.maximum(0.0, P - d / 2)
+    is_draw = r < d
+    a_wins = ~is_draw & (r < d + p_A)
+    goals_A = np.where(is_draw, draw_goals, np.where(a_wins, margin, loser_goals))
+    goals_B = np.where(is_draw, draw_goals, np.where(a_wins, loser_goals, margin))
+    return goals_A, goals_B
+
+# --------------------- ClubElo 갱신 (clubelo.EloReplay.update_elo도 이 식을 쓴다) ---------------------
+def expected_score(dr):
+    return 1 / (10 ** (-dr / 400) + 1)
+
+def g_factor(goal_diff):
+    # 스칼라를 넣으면 스칼라(0차원)로 돌려준다
+    goal_diff = np.asarray(goal_diff)
+    return np.where(goal_diff <= 1, 1.0, np.where(goal_diff == 2, 1.5, (11 + goal_diff) / 8.0))
+
+def elo_change(elo_home, elo_away, result_home, goal_diff=1, k=K_VALUE, hfa=HFA):
+    expected_home = expected_score(elo_home + hfa - elo_away)
+    return k * g_factor(goal_diff) * (result_home - expected_home)
+
+# --------------------- 배열 보조 함수 ---------------------
+class SharedRandom:
+    # 공통 난수: 첫 축이 (설정 수 × 시뮬 수)인 요청을 시뮬 수만큼만 뽑아 설정마다 그대로 반복한다.
+    # 설정끼리의 차이가 난수 잡음이 아니라 파라미터 차이만 반영하도록 민감도 분석에서 쓴다.
+    def __init__(self, rng, n_configs):
+        self.rng = rng
+        self.n_configs = n_configs
+
+    def _tile(self, draw, shape):
+        shape = tuple(shape)
+        base = draw((shape[0] // self.n_configs,) + shape[1:])
+        return np.tile(base, (self.n_configs,) + (1,) * (len(shape) - 1))
+
+    def random(self, shape):
+        return self._tile(self.rng.random, shape)
+
+    def integers(self, low, high, shape):
+        return self._tile(lambda sh: self.rng.integers(low, high, sh), shape)
+
+def iter_chunks(n_sims, chunk=CHUNK_SIMS):
+    done = 0
+    while done < n_sims:
+        size = min(chunk, n_sims - done)
+        yield size
+        done += size
+
+def _gather(values, idx):
+    # values: (팀,) 또는 (시뮬, 팀) / idx: (경기,) 또는 (시뮬, 경기)
+    if values.ndim == 1:
+        return values[idx]
+    if idx.ndim == 1:
+        return values[:, idx]
+    return np.take_along_axis(values, idx, axis=1)
+
+def _scatter_add(target, idx, vals):
+    n_sims, n_teams = target.shape
+    idx = np.broadcast_to(idx, vals.shape)
+    flat = (np.arange(n_sims)[:, None] * n_teams + idx).ravel()
+    added = np.bincount(flat, weights=vals.ravel(), minlength=n_sims * n_teams)
+    target += added.reshape(n_sims, n_teams).astype(target.dtype)
+
+def schedule_rounds(home, away):
+    # 팀마다 입력 순서를 지키면서, 한 라운드에 같은 팀이 두 번 나오지 않도록 묶는다
+    last_round = {}
+    round_of = []
+    for h, a in zip(home, away):
+        r = max(last_round.get(h, -1), last_round.get(a, -1)) + 1
+        last_round[h] = last_round[a] = r
+        round_of.append(r)
+    round_of = np.asarray(round_of, dtype=np.int64)
+    n_rounds = int(round_of.max()) + 1 if len(round_of) else 0
+    return [np.flatnonzero(round_of == r) for r in range(n_rounds)]
+
+def inverse_order(order):
+    # order[s, r] = r위 팀  →  rank[s, t] = t팀의 순위 (0부터)
+    n_sims, n_teams = order.shape
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.broadcast_to(np.arange(n_teams), order.shape), axis=1)
+    return rank
+
+def rank_counts(rank):
+    n_teams = rank.shape[1]
+    flat = (np.arange(n_teams)[None, :] * n_teams + rank).ravel()
+    return np.bincount(flat, minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+def team_arrays(teams, elo_key):
+    names = list(teams.keys())
+    elo = np.array([teams[t][elo_key] for t in names], dtype=np.float64)
+    home_bonus = np.array([teams[t].get("홈Elo보정", 0) for t in names], dtype=np.float64)
+    points = np.array([teams[t]["승점"] for t in names], dtype=np.int64)
+    return names, elo, home_bonus, points
+
+def match_indices(matches, names):
+    index = {t: i for i, t in enumerate(names)}
+    home = np.array([index[a] for a, _ in matches], dtype=np.int64)
+    away = np.array([index[b] for _, b in matches], dtype=np.int64)
+    return home, away
+
+# --------------------- 경기 진행 (승점 모델) ---------------------
+def play_fixtures(rng, points, elo, home_bonus, home, away, rounds=None,
+                  dynamic_elo=False, k_value=K_VALUE, params=None, buckets=None, prof=None):
+    # points: (시뮬, 팀) 승점, 제자리 갱신
+    # elo: 고정 Elo면 (팀,), 동적 Elo면 (시뮬, 팀)이며 제자리 갱신
+    # home/away: 모든 시뮬레이션 공통 일정 (경기,) 또는 시뮬레이션별 일정 (시뮬, 경기)
+    # params: 모델 상수 덮어쓰기 (_model_kwargs 참고)
+    # buckets: 고정 Elo 스플릿 2단계에서 시뮬레이션별 일정의 확률을 구성별 표에서 꺼낸다 (split_buckets 참고)
+    prof = get_profiler(prof)
+    n_sims = points.shape[0]
+    if not dynamic_elo:
+        rounds = [slice(None)]
+    elif rounds is None:
+        rounds = schedule_rounds(home if home.ndim == 1 else home[0], away if away.ndim == 1 else away[0])
+    for cols in rounds:
+        h = home[..., cols]
+        a = away[..., cols]
+        with prof.phase("경기확률"):
+            if buckets is not None:
+                p1, p_draw = _bucket_probabilities(buckets, elo, home_bonus, h, a, params)
+            else:
+                elo_h = _gather(elo, h)
+                elo_a = _gather(elo, a)
+                if elo_h.ndim == 1:
+                    # Elo와 일정이 모든 시뮬레이션에 공통이면 확률은 (설정별로) 한 번만 계산
+                    p1, p_draw, _ = match_probabilities(elo_h, elo_a, **_model_kwargs(params, home_bonus[h]))
+                else:
+                    p1, p_draw, _ = match_probabilities(elo_h, elo_a, **_model_kwargs(params, home_bonus[h], n_sims))
+        with prof.phase("샘플링"):
+            n_games = np.shape(p1)[-1]
+            u = rng.random((n_sims, n_games))
+            # p/Elo배율만 스윕하면 무승부 확률은 설정과 무관한 (경기,) 그대로이므로 모양을 맞춘다
+            p1, p_draw = np.broadcast_arrays(p1, p_draw)
+            if np.ndim(p1) == 2 and p1.shape[0] != n_sims:
+                # 설정별 확률 (설정, 경기): 행을 (설정, 시뮬, 경기)로 보고 브로드캐스트
+                n_cfg = p1.shape[0]
+                u = u.reshape(n_cfg, n_sims // n_cfg, n_games)
+                p1, p_draw = p1[:, None, :], p_draw[:, None, :]
+            home_win = (u < p1).reshape(n_sims, n_games)
+            draw = ~home_win & (u < p1 + p_draw).reshape(n_sims, n_games)
+            s1 = np.where(home_win, 3, np.where(draw, 1, 0))
+            s2 = np.where(home_win, 0, np.where(draw, 1, 3))
+            _scatter_add(points, h, s1)
+            _scatter_add(points, a, s2)
+            if dynamic_elo:
+                # 승점 모델은 골 수가 없으므로 G-factor는 1 (한 골 차)로 본다
+                result_home = np.where(home_win, 1.0, np.where(draw, 0.5, 0.0))
+                change = elo_change(elo_h, elo_a, result_home, k=k_value)
+                _scatter_add(elo, h, change)
+                _scatter_add(elo, a, -change)
+
+# --------------------- 스플릿 구성별 버킷 ---------------------
+# 정규리그가 끝나면 어느 팀이 상위 그룹에 드는지(구성)는 시뮬레이션 수보다 훨씬 적은 가짓수로 모인다.
+# 고정 Elo면 2단계 경기 확률은 구성(과 스윕 설정)에만 달렸으므로, 구성마다 그룹 안 모든 대진(양방향)의
+# 확률 표를 한 번 만들고 시뮬레이션은 자기 대진을 표에서 꺼낸다.
+# 그룹 안 순서까지 키로 쓰면 거의 모든 시뮬레이션이 서로 달라지므로, 순서에 따른 홈/원정은 열 선택으로 처리한다.
+def _n_configs(params):
+    return max((len(v) for v in (params or {}).values() if np.ndim(v) > 0), default=1)
+
+def split_buckets(order, n_top, n_cfg=1):
+    # order: (시뮬, 팀) 정규리그 순위순 팀 번호 / 팀이 62개를 넘으면 비트마스크 키를 쓸 수 없어 None
+    n_sims, n_teams = order.shape
+    if n_teams > 62:
+        return None
+    mask = (np.int64(1) << order[:, :n_top]).sum(axis=1)
+    _, mask_id = np.unique(mask, return_inverse=True)
+    cfg = np.arange(n_sims) // (n_sims // n_cfg)
+    _, first, inverse = np.unique(cfg * (mask_id.max() + 1) + mask_id, return_index=True, return_inverse=True)
+    in_top = np.zeros((len(first), n_teams), dtype=bool)
+    np.put_along_axis(in_top, order[first, :n_top], True, axis=1)
+    # 버킷 안 위치: 상위 그룹 팀 번호순, 이어서 하위 그룹 팀 번호순
+    canon = np.argsort(~in_top, axis=1, kind="stable")
+    return {"inverse": inverse.reshape(-1), "first": first, "canon": canon, "n_top": n_top}
+
+def _group_pairs(n_teams, n_top):
+    # 같은 그룹 위치끼리의 모든 (홈, 원정) 쌍과 (홈 위치, 원정 위치) → 열 번호 표
+    pairs = [pair for lo, hi in ((0, n_top), (n_top, n_teams)) for pair in permutations(range(lo, hi), 2)]
+    pos_home = np.array([h for h, _ in pairs], dtype=np.int64)
+    pos_away = np.array([a for _, a in pairs], dtype=np.int64)
+    col_of = np.full((n_teams, n_teams), -1, dtype=np.int64)
+    col_of[pos_home, pos_away] = np.arange(len(pairs))
+    return pos_home, pos_away, col_of
+
+def _bucket_probabilities(buckets, elo, home_bonus, home, away, params=None):
+    canon, inverse = buckets["canon"], buckets["inverse"]
+    n_sims = len(inverse)
+    pos_home, pos_away, col_of = _group_pairs(canon.shape[1], buckets["n_top"])
+    bucket_home, bucket_away = canon[:, pos_home], canon[:, pos_away]
+    # 스윕 설정 값은 버킷 대표 시뮬레이션의 행에서 (버킷마다 설정은 하나)
+    bucket_params = {key: value if np.ndim(value) == 0 else _expand_rows(value, n_sims)[buckets["first"]]
+                     for key, value in (params or {}).items()}
+    p1, p_draw, _ = match_probabilities(elo[bucket_home], elo[bucket_away],
+                                        **_model_kwargs(bucket_params, home_bonus[bucket_home]))
+    pos = inverse_order(canon)[inverse]
+    cols = col_of[np.take_along_axis(pos, home, axis=1), np.take_along_axis(pos, away, axis=1)]
+    rows = inverse[:, None]
+    return p1[rows, cols], p_draw[rows, cols]
+
+def _initial_state(teams, elo_key, n_sims, dynamic_elo):
+    names, elo, home_bonus, base_points = team_arrays(teams, elo_key)
+    points = np.tile(base_points, (n_sims, 1))
+    if dynamic_elo:
+        elo = np.tile(elo, (n_sims, 1))
+    return names, elo, home_bonus, points
+
+def _rank_by_points(points):
+    # 동점이면 입력 순서 유지 (sorted(..., reverse=True)와 같은 안정 정렬)
+    order = np.argsort(-points, axis=1, kind="stable")
+    return order, inverse_order(order)
+
+# --------------------- 포맷별 시뮬레이터 ---------------------
+# 각 함수는 n_sims개 시뮬레이션을 한 번에 돌려 최종 승점과 순위(0부터)를 (시뮬, 팀) 배열로 돌려준다.
+def simulate_league(rng, teams, matches, n_sims, elo_key="Elo",
+                    dynamic_elo=False, k_value=K_VALUE, params=None, prof=None):
+    prof = get_profiler(prof)
+    names, elo, home_bonus, points = _initial_state(teams, elo_key, n_sims, dynamic_elo)
+    home, away = match_indices(matches, names)
+    play_fixtures(rng, points, elo, home_bonus, home, away,
+                  dynamic_elo=dynamic_elo, k_value=k_value, params=params, prof=prof)
+    with prof.phase("정렬/순위"):
+        _, rank = _rank_by_points(points)
+    return {"points": points, "rank": rank}
+
+def k1_split_template(n_teams, n_top=6):
+    # k1.py 스플릿 대진: 순위 위치 i<j끼리, i가 짝수면 i 홈
+    home, away = [], []
+    for lo, hi in ((0, n_top), (n_top, n_teams)):
+        for i in range(hi - lo):
+            for j in range(i + 1, hi - lo):
+                h, a = (i, j) if (i % 2 == 0) else (j, i)
+                home.append(lo + h)
+                away.append(lo + a)
+    return np.array(home, dtype=np.int64), np.array(away, dtype=np.int64)
+
+def simulate_k1_split(rng, teams, matches, n_sims, n_top=6,
+                      dynamic_elo=False, k_value=K_VALUE, params=None, prof=None):
+    prof = get_profiler(prof)
+    names, elo, home_bonus, points = _initial_state(teams, "기본Elo", n_sims, dynamic_elo)
+    # 팀이 n_top보다 적으면 (기준 코드의 [:6] 슬라이스처럼) 모두 상위 그룹
+    n_top = min(n_top, len(names))
+    home, away = match_indices(matches, names)
+    play_fixtures(rng, points, elo, home_bonus, home, away,
+                  dynamic_elo=dynamic_elo, k_value=k_value, params=params, prof=prof)
+    with prof.phase("정렬/순위"):
+        order, regular_rank = _rank_by_points(points)
+    with prof.phase("대진생성"):
+        pos_home, pos_away = k1_split_template(len(names), n_top)
+        split_home = order[:, pos_home]
+        split_away = order[:, pos_away]
+        rounds = schedule_rounds(pos_home, pos_away)
+        buckets = None if dynamic_elo else split_buckets(order, n_top, _n_configs(params))
+    play_fixtures(rng, points, elo, home_bonus, split_home, split_away, rounds=rounds,
+                  dynamic_elo=dynamic_elo, k_value=k_value, params=params, buckets=buckets, prof=prof)
+    with prof.phase("정렬/순위"):
+        # 스플릿 A 팀이 항상 1~n_top위, 그룹 안에서는 승점 순 (동점은 입력 순서)
+        in_b = regular_rank >= n_top
+        final_order = np.lexsort((-points, in_b), axis=1)
+        rank = inverse_order(final_order)
+    return {"points": points, "rank": rank, "regular_rank": regular_rank}
+
+def playout_schedule(rng, n_sims, n_teams, cap=5):
+    # romania.py generate_playout_matches를 위치(0..n_teams-1) 공간에서 시뮬레이션별로 한 번에 생성
+    pairs = np.array(list(combinations(range(n_teams), 2)), dtype=np.int64).reshape(-1, 2)
+    n_pairs = len(pairs)
+    shuffled = np.argsort(rng.random((n_sims, n_pairs)), axis=1)
+    rows = np.arange(n_sims)
+    home = np.empty((n_sims, n_pairs), dtype=np.int64)
+    away = np.empty((n_sims, n_pairs), dtype=np.int64)
+    home_counts = np.zeros((n_sims, n_teams), dtype=np.int64)
+    away_counts = np.zeros((n_sims, n_teams), dtype=np.int64)
+    for step in range(n_pairs):
+        c = shuffled[:, step]
+        t1, t2 = pairs[c, 0], pairs[c, 1]
+        keep = (home_counts[rows, t1] < cap) & (away_counts[rows, t2] < cap)
+        h = np.where(keep, t1, t2)
+        a = np.where(keep, t2, t1)
+        home[rows, c] = h
+        away[rows, c] = a
+        home_counts[rows, h] += 1
+        away_counts[rows, a] += 1
+    return pairs, home, away
+
+def simulate_romania(rng, teams, matches, n_sims, n_top=6,
+                     dynamic_elo=False, k_value=K_VALUE, params=None, prof=None):
+    prof = get_profiler(prof)
+    names, elo, home_bonus, points = _initial_state(teams, "기본Elo", n_sims, dynamic_elo)
+    # 팀이 n_top보다 적으면 (기준 코드의 [:6] 슬라이스처럼) 모두 상위 그룹
+    n_top = min(n_top, len(names))
+    n_teams = len(names)
+    home, away = match_indices(matches, names)
+    play_fixtures(rng, points, elo, home_bonus, home, away,
+                  dynamic_elo=dynamic_elo, k_value=k_value, params=params, prof=prof)
+    with prof.phase("정렬/순위"):
+        # 플레이오프/아웃 직전, 승점 반토막 (round와 같은 짝수 반올림)
+        points = np.round(points / 2).astype(np.int64)
+        order, _ = _rank_by_points(points)
+    with prof.phase("대진생성"):
+        playoff = np.array(list(permutations(range(n_top), 2)), dtype=np.int64).reshape(-1, 2)
+        pairs, out_home, out_away = playout_schedule(rng, n_sims, n_teams - n_top)
+        pos_home = np.concatenate([np.broadcast_to(playoff[:, 0], (n_sims, len(playoff))), out_home + n_top], axis=1)
+        pos_away = np.concatenate([np.broadcast_to(playoff[:, 1], (n_sims, len(playoff))), out_away + n_top], axis=1)
+        rounds = schedule_rounds(np.concatenate([playoff[:, 0], pairs[:, 0] + n_top]),
+                                 np.concatenate([playoff[:, 1], pairs[:, 1] + n_top]))
+        split_home = np.take_along_axis(order, pos_home, axis=1)
+        split_away = np.take_along_axis(order, pos_away, axis=1)
+        buckets = None if dynamic_elo else split_buckets(order, n_top, _n_configs(params))
+    play_fixtures(rng, points, elo, home_bonus, split_home, split_away, rounds=rounds,
+                  dynamic_elo=dynamic_elo, k_value=k_value, params=params, buckets=buckets, prof=prof)
+    with prof.phase("정렬/순위"):
+        # 그룹 안에서 승점 순, 동점은 반토막 직후 순서 유지
+        pos_points = np.take_along_axis(points, order, axis=1)
+        in_playout = np.arange(n_teams) >= n_top
+        pos_order = np.lexsort((-pos_points, np.broadcast_to(in_playout, pos_points.shape)), axis=1)
+        rank = inverse_order(np.take_along_axis(order, pos_order, axis=1))
+    return {"points": points, "rank": rank}
+
+def simulate_east(rng, teams, matches, n_sims, draw_rate=0.24,
+                  dynamic_elo=False, k_value=K_VALUE, params=None, prof=None):
+    prof = get_profiler(prof)
+    if params and "무승부율" in params:
+        draw_rate = _expand_rows(params["무승부율"], n_sims)
+    names = list(teams.keys())
+    n_teams = len(names)
+    elo = np.array([teams[t]["Elo"] for t in names], dtype=np.float64)
+    if dynamic_elo:
+        elo = np.tile(elo, (n_sims, 1))
+    pts = np.tile(np.array([teams[t]["승점"] for t in names], dtype=np.int64), (n_sims, 1))
+    gd = np.tile(np.array([teams[t]["골득실"] for t in names], dtype=np.int64), (n_sims, 1))
+    home, away = match_indices(matches, names)
+    # 경기별 골득실 (홈 기준): 라운드마다 채우고 승점/골득실/상대전적은 반복이 끝난 뒤 한 번에 더한다
+    # (라운드 사이에 필요한 것은 동적 Elo뿐)
+    goal_diff = np.empty((n_sims, len(home)), dtype=np.int64)
+    rounds = schedule_rounds(home, away) if dynamic_elo else [slice(None)]
+    for cols in rounds:
+        a, b = home[cols], away[cols]
+        with prof.phase("경기확률"):
+            elo_a = np.broadcast_to(_gather(elo, a), (n_sims, len(a)))
+            elo_b = np.broadcast_to(_gather(elo, b), (n_sims, len(b)))
+            P = elo_win_prob(elo_a, elo_b)
+        with prof.phase("샘플링"):
+            g1, g2 = sample_scores(rng, P, draw_rate)
+            diff = g1 - g2
+            goal_diff[:, cols] = diff
+            if dynamic_elo:
+                # 중립 경기이므로 홈 어드밴티지 없음
+                result = np.where(diff > 0, 1.0, np.where(diff == 0, 0.5, 0.0))
+                change = elo_change(elo_a, elo_b, result, np.abs(diff), k=k_value, hfa=0.0)
+                _scatter_add(elo, a, change)
+                _scatter_add(elo, b, -change)
+    with prof.phase("샘플링"):
+        s1 = np.where(goal_diff > 0, 3, np.where(goal_diff == 0, 1, 0))
+        s2 = np.where(goal_diff < 0, 3, np.where(goal_diff == 0, 1, 0))
+        _scatter_add(pts, home, s1)
+        _scatter_add(pts, away, s2)
+        _scatter_add(gd, home, goal_diff)
+        _scatter_add(gd, away, -goal_diff)
+        # 상대전적: (시뮬, 팀*팀) 평탄화, [a*n+b] = a가 b 상대로 얻은 값
+        head_pts = np.zeros((n_sims, n_teams * n_teams), dtype=np.int64)
+        head_gd = np.zeros((n_sims, n_teams * n_teams), dtype=np.int64)
+        _scatter_add(head_pts, home * n_teams + away, s1)
+        _scatter_add(head_pts, away * n_teams + home, s2)
+        _scatter_add(head_gd, home * n_teams + away, goal_diff)
+        _scatter_add(head_gd, away * n_teams + home, -goal_diff)
+    with prof.phase("정렬/순위"):
+        # 동률 그룹 안에서 상대 승점 → 상대 골득실 → 전체 골득실, 그래도 같으면 입력 순서
+        same = pts[:, :, None] == pts[:, None, :]
+        hp = (head_pts.reshape(n_sims, n_teams, n_teams) * same).sum(axis=2)
+        hg = (head_gd.reshape(n_sims, n_teams, n_teams) * same).sum(axis=2)
+        order = np.lexsort((-gd, -hg, -hp, -pts), axis=1)
+        rank = inverse_order(order)
+    return {"points": pts, "gd": gd, "rank": rank}
+
+# 포맷 이름 → (시뮬레이터, 추가 인자). 스윕(sweep.py)과 분산 실행(distributed.py)이 공유한다.
+FORMATS = {
+    "league": (simulate_league, {"elo_key": "Elo"}),
+    "k1": (simulate_k1_split, {}),
+    "romania": (simulate_romania, {}),
+    "east": (simulate_east, {}),
+}
+
+# 포맷별로 모델이 실제로 쓰는 MODEL_PARAMS 키 (스윕 그리드 검증용)
+_POINTS_MODEL_PARAMS = ("홈Elo보정", "Elo배율", "p", "무승부_0", "무승부_100", "무승부_100_300", "무승부_300")
+FORMAT_PARAMS = {
+    "league": _POINTS_MODEL_PARAMS,
+    "k1": _POINTS_MODEL_PARAMS,
+    "romania": _POINTS_MODEL_PARAMS,
+    "east": ("무승부율",),
+}